@@ -1,10 +1,21 @@
-import os  
 import streamlit as st  
 import pandas as pd  
-import matplotlib.pyplot as plt  
 import datetime  
-import base64   
-import sqlite3    
+import time
+import uuid
+from functools import partial
+from storage import TABLES, VERSION_COLUMN, open_storage, primary_key, read_csv_table, type_frame
+from employee_index import EmployeeIndex
+from employee_directory import FILTER_COLUMNS, PAGE_SIZE, EmployeeDirectory, page_count
+from tables import KeyedTable
+from charts import ChartService
+from chart_data import top_n
+from reports import GROUP_BY_COLUMNS, REPORTS, ReportEngine, report_requirements
+from search import SEARCH_TABLES, highlight_markdown, search
+from exports import build_csv_export, export_file_name, export_mime, frame_chunks
+from timing import log_rerun_time
+
+rerun_started = time.perf_counter()
   
 # -------------------------------    
 # 1. Page Config & Data Directory    
@@ -17,232 +28,298 @@ st.set_page_config(
 )    
     
 DATA_DIR = 'data'    
-if not os.path.exists(DATA_DIR):    
-    os.makedirs(DATA_DIR)    
-  
-# -------------------------------  
-# SQLite Database Initialization  
-# -------------------------------  
-def init_sqlite_db():  
-    """Initialize SQLite database with required tables"""  
-    conn = sqlite3.connect('employee_database.db')  
-    cursor = conn.cursor()  
-      
-    # Create the employees table  
-    cursor.execute("""  
-    CREATE TABLE IF NOT EXISTS employees (  
-        employee_id TEXT PRIMARY KEY,  
-        first_name TEXT,  
-        last_name TEXT,  
-        department TEXT,  
-        job_title TEXT,  
-        email TEXT,  
-        phone TEXT,  
-        employment_status TEXT  
-    )  
-    """)  
-      
-    # Create the meetings table  
-    cursor.execute("""  
-    CREATE TABLE IF NOT EXISTS meetings (  
-        meeting_id TEXT PRIMARY KEY,  
-        employee_id TEXT,  
-        meeting_date TEXT,  
-        meeting_time TEXT,  
-        MeetingAgenda TEXT,  
-        action_items TEXT,  
-        notes TEXT,  
-        next_meeting_date TEXT  
-    )  
-    """)  
-      
-    # Create the disciplinary table  
-    cursor.execute("""  
-    CREATE TABLE IF NOT EXISTS disciplinary (  
-        disciplinary_id TEXT PRIMARY KEY,  
-        employee_id TEXT,  
-        type TEXT,  
-        date TEXT,  
-        description TEXT  
-    )  
-    """)  
-      
-    # Create the performance table  
-    cursor.execute("""  
-    CREATE TABLE IF NOT EXISTS performance (  
-        review_id TEXT PRIMARY KEY,  
-        employee_id TEXT,  
-        review_date TEXT,  
-        reviewer TEXT,  
-        score TEXT,  
-        comments TEXT  
-    )  
-    """)  
-      
-    # Create the training table  
-    cursor.execute("""  
-    CREATE TABLE IF NOT EXISTS training (  
-        training_id TEXT PRIMARY KEY,  
-        employee_id TEXT,  
-        course_name TEXT,  
-        start_date TEXT,  
-        end_date TEXT,  
-        status TEXT,  
-        certification TEXT  
-    )  
-    """)  
-      
-    conn.commit()  
-    conn.close()  
-  
-# Initialize SQLite database immediately  
-init_sqlite_db()  
+DB_NAME = 'employee_database.db'
+# Where tables live: 'sqlite' (DB_NAME) or a columnar snapshot format in DATA_DIR ('parquet' or 'arrow')
+STORAGE_BACKEND = 'sqlite'
+
+@st.cache_resource
+def get_storage():
+    """Process-wide storage engine: schema bootstrap, shared table cache and persistence"""
+    return open_storage(STORAGE_BACKEND, DB_NAME if STORAGE_BACKEND == 'sqlite' else DATA_DIR)
+
+# Create tables and indexes (once per process)
+get_storage()
   
 # -------------------------------  
 # 2. CSV Download Helper Function  
 # -------------------------------  
-def get_csv_download_link(df, filename, label='Download CSV file'):  
-    csv = df.to_csv(index=False)  
-    b64 = base64.b64encode(csv.encode()).decode()  
-    return f'<a href="data:file/csv;base64,{b64}" download="{filename}">{label}</a>'  
+def csv_download(get_df, filename, label, key):
+    """Serve a table as CSV through st.download_button, building it (from `get_df()`) only when clicked.
+
+    `get_df` runs on a separate thread, so it must not read st.session_state."""
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        compress = st.checkbox("gzip", key=key + "_gzip")
+    with col2:
+        st.download_button(
+            label,
+            data=lambda: build_csv_export(frame_chunks(get_df()), compress),
+            file_name=export_file_name(filename, compress),
+            mime=export_mime(compress),
+            key=key + "_download",
+            on_click="ignore",
+        )
+
+TABLE_PREVIEW_ROWS = 200
+
+def show_table_preview(table):
+    """Show the most recent rows of a table without compacting its edits"""
+    st.dataframe(table.tail(TABLE_PREVIEW_ROWS))
+    if len(table) > TABLE_PREVIEW_ROWS:
+        st.caption(f"Showing the latest {TABLE_PREVIEW_ROWS} of {len(table)} records. Download the CSV for the full table.")
+
+@st.cache_resource
+def get_chart_service():
+    """Process-wide chart renderer with a cache of rendered chart bytes"""
+    return ChartService()
+
+def plot_report(report_df, report_type):
+    """Bar chart of a report table: its group columns against the aggregated (last) column,
+    limited to the top groups plus "Other" unless the report is a time series"""
+    spec = REPORTS[report_type]
+    keys, value = list(report_df.columns[:-1]), report_df.columns[-1]
+    if not spec.get("ordered"):
+        report_df = top_n(report_df, keys, value, other_agg="mean" if spec["agg"] == "mean" else "sum")
+    st.image(get_chart_service().bar_chart(report_df, keys, value, report_type, spec["ylabel"]))
 
 # -------------------------------  
 # 3. Data Persistence Functions  
 # -------------------------------  
-def load_table(table_name, columns):  
-    path = os.path.join(DATA_DIR, f'{table_name}.csv')  
-    if os.path.exists(path):  
-        return pd.read_csv(path)  
-    else:  
-        return pd.DataFrame({col: [] for col in columns})  
-  
-def save_table(table_name, df):  
-    path = os.path.join(DATA_DIR, f'{table_name}.csv')  
-    df.to_csv(path, index=False)  
-    st.success(f"{table_name.capitalize()} data saved successfully!")  
-  
+def has_pending_changes(table_name):
+    """True if this session has unsaved edits to a table"""
+    return table_name in st.session_state and st.session_state[table_name].dirty
+
+def bind_table(table_name, columns=None):
+    """This session's view of the shared, cached frame of a table"""
+    return KeyedTable(get_storage().load(table_name, columns), primary_key(table_name), partial(type_frame, table_name))
+
+def load_tables(requirements):
+    """Bind the tables a module or report needs to the shared, cached frames.
+
+    `requirements` maps table name -> needed columns (None = all). Tables with
+    unsaved edits keep this session's own edits on top of their base frame."""
+    for table_name, columns in requirements.items():
+        if has_pending_changes(table_name):
+            continue
+        shared = get_storage().load(table_name, columns)
+        if table_name not in st.session_state or st.session_state[table_name].base is not shared:
+            st.session_state[table_name] = bind_table(table_name, columns)
+
+def save_key(table_name):
+    """Writer queue key of this session's saves to a table (a newer save replaces a still-queued one)"""
+    if "session_key" not in st.session_state:
+        st.session_state.session_key = uuid.uuid4().hex
+    return (st.session_state.session_key, table_name)
+
+def save_table(table_name):
+    """Queue this session's pending changes to one table for the background writer (write-behind).
+
+    The edits stay on screen while the save is in flight and settle_saves() applies
+    its outcome. Each row carries the version this session loaded, so a row someone
+    else has saved since is reported as a conflict instead of being overwritten."""
+    table = st.session_state[table_name]
+    keys = table.upserted_keys | table.deleted_keys
+    future = get_storage().submit(
+        table_name, table.changed_frame(), table.upserted_keys, table.deleted_keys,
+        table.base_values(VERSION_COLUMN, keys), key=save_key(table_name),
+    )
+    st.session_state.setdefault("pending_saves", {})[table_name] = (future, table.revision)
+    st.session_state.setdefault("save_errors", {}).pop(table_name, None)
+
+def save_all_data():
+    """Queue all pending changes"""
+    for table_name in TABLES:
+        if has_pending_changes(table_name):
+            save_table(table_name)
+
+def settle_saves():
+    """Apply the outcome of this session's finished background saves; returns the tables still saving"""
+    pending = st.session_state.setdefault("pending_saves", {})
+    errors = st.session_state.setdefault("save_errors", {})
+    for table_name, (future, revision) in list(pending.items()):
+        if not future.done():
+            continue
+        del pending[table_name]
+        table = st.session_state[table_name]
+        if not future.exception():
+            # The table is rebased or settled on reloaded rows below, which carry the committed versions
+            get_storage().forget(save_key(table_name))
+        if future.exception() is not None:
+            errors[table_name] = f"{table_name.capitalize()} not saved: {future.exception()}. Your edits are kept; save again to retry."
+            continue
+        result = future.result()
+        if result.conflicts:
+            # Show the latest saved rows; keep this session's edits to every other row
+            table.rebase(get_storage().load(table_name), drop=result.conflicts)
+            if table_name == "employees":
+                st.session_state.employee_index = EmployeeIndex.from_frame(table.frame())
+            ids = ", ".join(sorted(result.conflicts)[:10])
+            errors[table_name] = (
+                f"{table_name.capitalize()} not saved: {len(result.conflicts)} record(s) were changed by another user "
+                f"since you loaded them (ID {ids}). Their version is shown now and your edits to those records were "
+                "dropped; save again to write your other changes."
+            )
+            continue
+        # Edits made after this save was queued stay pending on top of the saved rows
+        table.settle(get_storage().load(table_name), revision)
+        if table_name == "employees" and not table.dirty:
+            st.session_state.pop("employee_index", None)
+        st.toast(f"{table_name.capitalize()} data saved")
+        print(f"{table_name.capitalize()} data saved: {result.upserted} upserted, {result.deleted} deleted")
+    return set(pending)
+
+def save_status():
+    """Sidebar status of this session's saves and of the shared writer"""
+    saving = settle_saves()
+    unsaved = [table_name for table_name in TABLES if has_pending_changes(table_name) and table_name not in saving]
+    if saving:
+        st.caption(f"⏳ Saving {', '.join(sorted(saving))}…")
+    elif unsaved:
+        st.caption(f"✏️ Unsaved changes: {', '.join(unsaved)}")
+    else:
+        st.caption("✅ All changes saved")
+    status = get_storage().status()
+    if status["last_commit"] is not None:
+        committed = datetime.datetime.fromtimestamp(status["last_commit"]).strftime("%H:%M:%S")
+        st.caption(f"Last write committed to storage at {committed} ({status['queued'] + status['writing']} queued)")
+    for message in st.session_state.save_errors.values():
+        st.error(message)
+    if not saving and st.session_state.get("status_polling"):
+        # Everything landed: refresh the page once with the saved data and stop polling
+        st.session_state.status_polling = False
+        st.rerun()
+
+@st.cache_resource(max_entries=2)
+def get_shared_employee_index(version):
+    """Employee lookup index built once per saved version of the employees table"""
+    return EmployeeIndex.from_frame(get_storage().load("employees", EMPLOYEE_JOIN_COLUMNS))
+
+def get_employee_index():
+    """This session's index while it has unsaved employee edits, otherwise the shared one"""
+    if "employee_index" in st.session_state and has_pending_changes("employees"):
+        return st.session_state.employee_index
+    return get_shared_employee_index(get_storage().version("employees"))
+
+def edit_employee_index():
+    """Index for incremental updates: this session's own copy, made on the first edit"""
+    if "employee_index" not in st.session_state:
+        st.session_state.employee_index = get_employee_index().copy()
+    return st.session_state.employee_index
+
+@st.cache_resource(max_entries=2)
+def get_shared_employee_directory(version):
+    """Employee search index built once per saved version of the employees table"""
+    return EmployeeDirectory(get_storage().load("employees"))
+
+def get_employee_directory():
+    """Search index over this session's employees: the shared one unless there are unsaved edits"""
+    table = st.session_state.employees
+    if not table.dirty:
+        return get_shared_employee_directory(get_storage().version("employees"))
+    cached = st.session_state.get("employee_directory")
+    if cached is None or cached[0] is not table.base or cached[1] != table.revision:
+        cached = (table.base, table.revision, EmployeeDirectory(table.frame()))
+        st.session_state.employee_directory = cached
+    return cached[2]
+
+def show_employee_directory():
+    """Filtered, prefix-searched employees, sending one page of rows to the browser"""
+    directory = get_employee_directory()
+    search_text = st.text_input("Search by name, email or ID", placeholder="Starts with…")
+    filters = {}
+    for col, (label, column) in zip(st.columns(len(FILTER_COLUMNS)), FILTER_COLUMNS.items()):
+        with col:
+            filters[column] = st.multiselect(label, directory.options(column), key=f"employee_filter_{column}")
+    rows = directory.search(search_text, filters)
+    pages = page_count(len(rows))
+    page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1) if pages > 1 else 1
+    st.dataframe(directory.page(rows, page))
+    st.caption(f"{len(rows)} of {len(directory)} employees · page {page} of {pages} ({PAGE_SIZE} per page)")
+
+@st.cache_resource
+def get_report_engine():
+    """Process-wide report engine; its memoized results are shared by every session"""
+    return ReportEngine()
+
+def report_versions(report_type):
+    """Saved versions of the tables a report reads, or None (no memoizing) while this session has unsaved edits to them"""
+    if any(has_pending_changes(table_name) for table_name in REPORT_TABLES[report_type]):
+        return None
+    return tuple(get_storage().version(table_name) for table_name in REPORT_TABLES[report_type])
+
+def report_query(report_type):
+    """Query function to push a report down to SQLite, or None to run it in memory
+    (snapshot backend, or unsaved edits in this session that the database doesn't have yet)"""
+    if get_storage().supports_sql and report_versions(report_type) is not None:
+        return get_storage().query
+    return None
+
 def get_employee_display_name(employee_id):  
     if employee_id is None or pd.isna(employee_id):  
         return "N/A"  
-    employee = st.session_state.employees[st.session_state.employees['employee_id'] == employee_id]  
-    if not employee.empty:  
-        return f"{employee['first_name'].values[0]} {employee['last_name'].values[0]}"  
-    return "Unknown"  
+    return get_employee_index().display_name(employee_id)
   
-def load_from_uploaded_file(uploaded_file, columns):  
+def load_from_uploaded_file(uploaded_file, table_name):
     try:  
-        df = pd.read_csv(uploaded_file)  
-        # Ensure all required columns exist  
-        for col in columns:  
-            if col not in df.columns:  
-                df[col] = ""  
-        return df  
+        return read_csv_table(table_name, uploaded_file)
     except Exception as e:  
         st.error(f"Error loading file: {e}")  
-        return pd.DataFrame({col: [] for col in columns})  
+        return None
 
-# -------------------------------  
-# 4. SQLite Data Persistence Functions  
-# -------------------------------  
-def load_table_from_sqlite(table_name):  
-    """Load a table from SQLite database"""  
-    try:  
-        conn = sqlite3.connect('employee_database.db')  
-        df = pd.read_sql(f"SELECT * FROM {table_name}", conn)  
-        conn.close()  
-        return df  
-    except Exception as e:  
-        print(f"Error loading {table_name} from SQLite: " + str(e))  
-        # Return empty DataFrame with appropriate columns  
-        if table_name == "employees":  
-            return pd.DataFrame(columns=employee_columns)  
-        elif table_name == "meetings":  
-            return pd.DataFrame(columns=meeting_columns)  
-        elif table_name == "disciplinary":  
-            return pd.DataFrame(columns=disciplinary_columns)  
-        elif table_name == "performance":  
-            return pd.DataFrame(columns=performance_columns)  
-        elif table_name == "training":  
-            return pd.DataFrame(columns=training_columns)  
-        else:  
-            return pd.DataFrame()  
-  
-def save_table_to_sqlite(table_name, df):  
-    """Save a table to SQLite database"""  
-    if df is None or df.empty:  
-        print(f"Not saving {table_name} - data is empty")  
-        return  
-    conn = sqlite3.connect('employee_database.db')  
-    df.to_sql(table_name, conn, if_exists='replace', index=False)  
-    conn.close()  
-    print(f"{table_name.capitalize()} data saved successfully!")  
-  
-def load_all_data_sqlite():  
-    """Load all data from SQLite database"""  
-    tables = ["employees", "meetings", "disciplinary", "performance", "training"]  
-    for table_name in tables:  
-        st.session_state[table_name] = load_table_from_sqlite(table_name)  
-        print(f"Loaded {table_name} data: {len(st.session_state[table_name])} records")  
-  
-def save_all_data_sqlite():  
-    """Save all data to SQLite database"""  
-    tables = ["employees", "meetings", "disciplinary", "performance", "training"]  
-    for table_name in tables:  
-        if table_name in st.session_state and not st.session_state[table_name].empty:  
-            save_table_to_sqlite(table_name, st.session_state[table_name])  
-    st.success("All data saved successfully!")  
-  
-# -------------------------------  
-# 5. Session State Initialization & File Uploaders  
-# -------------------------------  
-# (Assuming you have definitions like these somewhere in your original code)  
-employee_columns = ['employee_id', 'first_name', 'last_name', 'department', 'job_title', 'email', 'phone', 'employment_status']  
-meeting_columns = ['meeting_id', 'employee_id', 'meeting_date', 'meeting_time', 'MeetingAgenda', 'action_items', 'notes', 'next_meeting_date']  
-disciplinary_columns = ['disciplinary_id', 'employee_id', 'type', 'date', 'description']  
-performance_columns = ['review_id', 'employee_id', 'review_date', 'reviewer', 'score', 'comments']  
-training_columns = ['training_id', 'employee_id', 'course_name', 'start_date', 'end_date', 'status', 'certification']  
-  
-# -------------------------------  
-# Initialize session state data from SQLite if not already loaded  
-# -------------------------------  
-if "data_loaded" not in st.session_state:  
-    st.session_state.data_loaded = False  
-  
-if not st.session_state.data_loaded:  
-    load_all_data_sqlite()  
-    st.session_state.data_loaded = True  
+def upload_table(table_name, uploaded_file):
+    """Replace a session table with an uploaded CSV, recorded as row upserts and deletes.
+
+    The uploader keeps its file across reruns, so each file is applied once: applying
+    it again would undo edits and saves made since. Returns True if this call applied it."""
+    applied_key = f"{table_name}_upload_applied"
+    if st.session_state.get(applied_key) == uploaded_file.file_id:
+        return False
+    st.session_state[applied_key] = uploaded_file.file_id
+    uploaded_df = load_from_uploaded_file(uploaded_file, table_name)
+    if uploaded_df is None:
+        return False
+    st.session_state[table_name].replace(uploaded_df)
+    if table_name == "employees":
+        st.session_state.employee_index = EmployeeIndex.from_frame(st.session_state.employees.frame())
+    return True
   
 # -------------------------------  
-# 6. Other Application Logic / Functions (Your original code remains untouched)  
+# 4. Table Dependencies
 # -------------------------------  
-# ... (All your additional functions, routes, page logic, etc.)  
+# Tables are loaded on demand, the first time a module or report needs them.
+# Each entry maps table name -> columns needed (None = all columns).
+EMPLOYEE_JOIN_COLUMNS = ["employee_id", "first_name", "last_name", "department", "job_title"]
+
+MODULE_TABLES = {
+    "Employee Management": {"employees": None},
+    "One-on-One Meetings": {"meetings": None},
+    "Disciplinary Actions": {"disciplinary": None},
+    "Performance Reviews": {"performance": None},
+    "Training Records": {"training": None},
+    "Search Notes": {},
+    "Reports": {},
+}
+
+def report_tables(report):
+    """Tables a report reads, plus the employee columns the join and the 'no employees' check use"""
+    requirements = report_requirements(report)
+    extra = [col for col in requirements.pop("employees", []) if col not in EMPLOYEE_JOIN_COLUMNS]
+    return {"employees": EMPLOYEE_JOIN_COLUMNS + extra, **requirements}
+
+REPORT_TABLES = {report: report_tables(report) for report in REPORTS}
   
 # -------------------------------  
-# 7. Sidebar: Save Button for SQLite Persistence  
+# 5. Sidebar: Save Button  
 # -------------------------------  
+# Saves run in the background; the status below polls them while any are in flight
+SAVE_STATUS_REFRESH = 1  # seconds
+
 st.sidebar.title("Data Management")  
-if st.sidebar.button("💾 Save All Data"):  
-    save_all_data_sqlite()  
-  
-# -------------------------------  
-# 7. Initialize Session State  
-# -------------------------------  
-employee_columns = ["employee_id", "first_name", "last_name", "department", "job_title", "email", "phone", "employment_status"]  
-meeting_columns = ["meeting_id", "employee_id", "meeting_date", "meeting_time", "Meeting Agenda", "action_items", "notes", "next_meeting_date"]  
-disciplinary_columns = ["disciplinary_id", "employee_id", "type", "date", "description"]  
-performance_columns = ["review_id", "employee_id", "review_date", "reviewer", "score", "comments"]  
-training_columns = ["training_id", "employee_id", "course_name", "start_date", "end_date", "status", "certification"]  
-  
-if 'employees' not in st.session_state:  
-    st.session_state.employees = load_table("employees", employee_columns)  
-if 'meetings' not in st.session_state:  
-    st.session_state.meetings = load_table("meetings", meeting_columns)  
-if 'disciplinary' not in st.session_state:  
-    st.session_state.disciplinary = load_table("disciplinary", disciplinary_columns)  
-if 'performance' not in st.session_state:  
-    st.session_state.performance = load_table("performance", performance_columns)  
-if 'training' not in st.session_state:  
-    st.session_state.training = load_table("training", training_columns)  
+st.sidebar.button("💾 Save All Data", on_click=save_all_data)
+settle_saves()
+st.session_state.status_polling = bool(st.session_state.pending_saves)
+with st.sidebar:
+    st.fragment(save_status, run_every=SAVE_STATUS_REFRESH if st.session_state.status_polling else None)()
   
 # -------------------------------  
 # 8. Sidebar Navigation  
@@ -250,8 +327,9 @@ if 'training' not in st.session_state:
 st.sidebar.title("Employee Records Tool")  
 module = st.sidebar.selectbox(  
     "Select Module",  
-    ["Employee Management", "One-on-One Meetings", "Disciplinary Actions", "Performance Reviews", "Training Records", "Reports"]  
+    list(MODULE_TABLES)
 )  
+load_tables(MODULE_TABLES[module])
   
 # -------------------------------  
 # 6. Module: Employee Management  
@@ -261,8 +339,7 @@ if module == "Employee Management":
       
     # CSV Upload option  
     uploaded_employees = st.file_uploader("Upload Employees CSV", type="csv", key="employee_upload")  
-    if uploaded_employees is not None:  
-        st.session_state.employees = load_from_uploaded_file(uploaded_employees, employee_columns)  
+    if uploaded_employees is not None and upload_table("employees", uploaded_employees):
         st.success("Employee data uploaded successfully!")  
       
     with st.form("employee_form"):  
@@ -283,29 +360,26 @@ if module == "Employee Management":
             if employee_id == "" or not employee_id.isdigit():  
                 st.error("Please enter a valid numeric Employee ID (up to 6 digits).")  
             else:  
-                new_employee = pd.DataFrame({  
-                    "employee_id": [employee_id],  
-                    "first_name": [first_name],  
-                    "last_name": [last_name],  
-                    "department": [department],  
-                    "job_title": [job_title],  
-                    "email": [email],  
-                    "phone": [phone],  
-                    "employment_status": [employment_status],  
-                })  
-                  
-                # Check if employee already exists  
-                if int(employee_id) in st.session_state.employees['employee_id'].values:  
-                    st.session_state.employees = st.session_state.employees[st.session_state.employees['employee_id'] != int(employee_id)]  
+                new_employee = {  
+                    "employee_id": employee_id,  
+                    "first_name": first_name,  
+                    "last_name": last_name,  
+                    "department": department,  
+                    "job_title": job_title,  
+                    "email": email,  
+                    "phone": phone,  
+                    "employment_status": employment_status,  
+                }  
                   
-                st.session_state.employees = pd.concat([st.session_state.employees, new_employee], ignore_index=True)  
+                # Upsert by primary key: an existing employee is updated in place
+                st.session_state.employees.upsert(new_employee)
+                edit_employee_index().upsert(employee_id, first_name, last_name, department, job_title)
                 st.success("Employee added/updated successfully!")  
       
     st.subheader("Employees Table")  
-    st.dataframe(st.session_state.employees)  
-    st.markdown(get_csv_download_link(st.session_state.employees, "employees.csv", "Download Employees CSV"), unsafe_allow_html=True)  
-    if st.button("Save Employee Data"):  
-        save_table("employees", st.session_state.employees)  
+    show_employee_directory()
+    csv_download(st.session_state.employees.frame, "employees.csv", "Download Employees CSV", key="employees_export")  
+    st.button("Save Employee Data", on_click=save_table, args=("employees",))
   
 # -------------------------------  
 # 9. Module: One-on-One Meetings  
@@ -315,8 +389,7 @@ elif module == "One-on-One Meetings":
       
     # CSV Upload option  
     uploaded_meetings = st.file_uploader("Upload Meetings CSV", type="csv", key="meetings_upload")  
-    if uploaded_meetings is not None:  
-        st.session_state.meetings = load_from_uploaded_file(uploaded_meetings, meeting_columns)  
+    if uploaded_meetings is not None and upload_table("meetings", uploaded_meetings):
         st.success("Meetings data uploaded successfully!")  
       
     with st.form("meeting_form"):  
@@ -338,41 +411,34 @@ elif module == "One-on-One Meetings":
             elif employee_id == "" or not employee_id.isdigit():  
                 st.error("Please enter a valid numeric Employee ID (up to 6 digits).")  
             else:  
-                new_meeting = pd.DataFrame({  
-                    "meeting_id": [meeting_id],  
-                    "employee_id": [employee_id],  
-                    "meeting_date": [meeting_date.strftime('%Y-%m-%d')],  
-                    "meeting_time": [meeting_time.strftime('%H:%M:%S')],  
-                    "Meeting Agenda": [meeting_agenda],  
-                    "action_items": [action_items],  
-                    "notes": [notes],  
-                    "next_meeting_date": [next_meeting_date.strftime('%Y-%m-%d')]  
-                })  
-                st.session_state.meetings = pd.concat([st.session_state.meetings, new_meeting], ignore_index=True)  
+                new_meeting = {  
+                    "meeting_id": meeting_id,  
+                    "employee_id": employee_id,  
+                    "meeting_date": meeting_date.strftime('%Y-%m-%d'),  
+                    "meeting_time": meeting_time.strftime('%H:%M:%S'),  
+                    "MeetingAgenda": meeting_agenda,  
+                    "action_items": action_items,  
+                    "notes": notes,  
+                    "next_meeting_date": next_meeting_date.strftime('%Y-%m-%d')  
+                }  
+                st.session_state.meetings.upsert(new_meeting)
                 st.success("Meeting recorded successfully!")  
       
     st.subheader("Meetings Table")  
-    st.dataframe(st.session_state.meetings)  
-    st.markdown(get_csv_download_link(st.session_state.meetings, "meetings.csv", "Download Meetings CSV"), unsafe_allow_html=True)  
-    if st.button("Save Meetings Data"):  
-        save_table("meetings", st.session_state.meetings)  
+    show_table_preview(st.session_state.meetings)
+    csv_download(st.session_state.meetings.frame, "meetings.csv", "Download Meetings CSV", key="meetings_export")  
+    st.button("Save Meetings Data", on_click=save_table, args=("meetings",))
   
 # -------------------------------  
 # 10. Module: Disciplinary Actions  
 # -------------------------------  
 elif module == "Disciplinary Actions":  
     st.header("Disciplinary Actions")  
-    # Updated column structure for disciplinary actions:  
-    # ["Period (Date)", "disciplinary_id", "ID", "First Name", "Last Name", "Job Title",  
-    #  "Violation", "Interview Date", "Reason", "Comments", "Interviewer", "Decision"]  
+    # Employee names and job titles come from the employees table via the employee ID
       
     # CSV Upload option  
     uploaded_disciplinary = st.file_uploader("Upload Disciplinary CSV", type="csv", key="disciplinary_upload")  
-    if uploaded_disciplinary is not None:  
-        # When uploading, ensure the file has at least the required columns (if missing, fill with empty string)  
-        required_cols = ["Period (Date)", "disciplinary_id", "ID", "First Name", "Last Name",  
-                         "Job Title", "Violation", "Interview Date", "Reason", "Comments", "Interviewer", "Decision"]  
-        st.session_state.disciplinary = load_from_uploaded_file(uploaded_disciplinary, required_cols)  
+    if uploaded_disciplinary is not None and upload_table("disciplinary", uploaded_disciplinary):
         st.success("Disciplinary data uploaded successfully!")  
       
     # Updated Form for Disciplinary Actions  
@@ -384,16 +450,13 @@ elif module == "Disciplinary Actions":
             period_date = st.date_input("Period (Date)", datetime.date.today())  
             disciplinary_id = st.text_input("Disciplinary ID (max 6 digits)", max_chars=6)  
             emp_id = st.text_input("ID (Employee ID - max 6 digits)", max_chars=6)  
-            first_name = st.text_input("First Name")  
         with col2:  
-            last_name = st.text_input("Last Name")  
-            job_title = st.text_input("Job Title")  
             violation = st.text_input("Violation")  
             interview_date = st.date_input("Interview Date", datetime.date.today())  
+            interviewer = st.text_input("Interviewer")  
         with col3:  
             reason = st.text_area("Reason")  
             comments = st.text_area("Comments")  
-            interviewer = st.text_input("Interviewer")  
             decision = st.text_input("Decision")  
           
         submitted_disc = st.form_submit_button("Record Disciplinary Action")  
@@ -404,28 +467,24 @@ elif module == "Disciplinary Actions":
             elif emp_id == "" or not emp_id.isdigit():  
                 st.error("Please enter a valid numeric Employee ID (up to 6 digits).")  
             else:  
-                new_disc = pd.DataFrame({  
-                    "Period (Date)": [period_date.strftime('%Y-%m-%d')],  
-                    "disciplinary_id": [disciplinary_id],  
-                    "ID": [emp_id],  
-                    "First Name": [first_name],  
-                    "Last Name": [last_name],  
-                    "Job Title": [job_title],  
-                    "Violation": [violation],  
-                    "Interview Date": [interview_date.strftime('%Y-%m-%d')],  
-                    "Reason": [reason],  
-                    "Comments": [comments],  
-                    "Interviewer": [interviewer],  
-                    "Decision": [decision]  
-                })  
-                st.session_state.disciplinary = pd.concat([st.session_state.disciplinary, new_disc], ignore_index=True)  
+                new_disc = {  
+                    "disciplinary_id": disciplinary_id,  
+                    "employee_id": emp_id,
+                    "date": period_date.strftime('%Y-%m-%d'),
+                    "violation": violation,
+                    "interview_date": interview_date.strftime('%Y-%m-%d'),
+                    "reason": reason,
+                    "comments": comments,
+                    "interviewer": interviewer,
+                    "decision": decision
+                }  
+                st.session_state.disciplinary.upsert(new_disc)
                 st.success("Disciplinary action recorded successfully!")  
       
     st.subheader("Disciplinary Actions Table")  
-    st.dataframe(st.session_state.disciplinary)  
-    st.markdown(get_csv_download_link(st.session_state.disciplinary, "disciplinary.csv", "Download Disciplinary CSV"), unsafe_allow_html=True)  
-    if st.button("Save Disciplinary Data"):  
-        save_table("disciplinary", st.session_state.disciplinary)  
+    show_table_preview(st.session_state.disciplinary)
+    csv_download(st.session_state.disciplinary.frame, "disciplinary.csv", "Download Disciplinary CSV", key="disciplinary_export")  
+    st.button("Save Disciplinary Data", on_click=save_table, args=("disciplinary",))
 # -------------------------------  
 # 11. Module: Performance Reviews  
 # -------------------------------  
@@ -434,8 +493,7 @@ elif module == "Performance Reviews":
       
     # CSV Upload option  
     uploaded_performance = st.file_uploader("Upload Performance CSV", type="csv", key="performance_upload")  
-    if uploaded_performance is not None:  
-        st.session_state.performance = load_from_uploaded_file(uploaded_performance, performance_columns)  
+    if uploaded_performance is not None and upload_table("performance", uploaded_performance):
         st.success("Performance data uploaded successfully!")  
       
     with st.form("performance_form"):  
@@ -455,22 +513,21 @@ elif module == "Performance Reviews":
             elif employee_id == "" or not employee_id.isdigit():  
                 st.error("Please enter a valid numeric Employee ID (up to 6 digits).")  
             else:  
-                new_review = pd.DataFrame({  
-                    "review_id": [review_id],  
-                    "employee_id": [employee_id],  
-                    "review_date": [review_date.strftime('%Y-%m-%d')],  
-                    "reviewer": [reviewer],  
-                    "score": [score],  
-                    "comments": [comments]  
-                })  
-                st.session_state.performance = pd.concat([st.session_state.performance, new_review], ignore_index=True)  
+                new_review = {  
+                    "review_id": review_id,  
+                    "employee_id": employee_id,  
+                    "review_date": review_date.strftime('%Y-%m-%d'),  
+                    "reviewer": reviewer,  
+                    "score": score,  
+                    "comments": comments  
+                }  
+                st.session_state.performance.upsert(new_review)
                 st.success("Performance review recorded successfully!")  
       
     st.subheader("Performance Reviews Table")  
-    st.dataframe(st.session_state.performance)  
-    st.markdown(get_csv_download_link(st.session_state.performance, "performance.csv", "Download Performance CSV"), unsafe_allow_html=True)  
-    if st.button("Save Performance Data"):  
-        save_table("performance", st.session_state.performance)  
+    show_table_preview(st.session_state.performance)
+    csv_download(st.session_state.performance.frame, "performance.csv", "Download Performance CSV", key="performance_export")  
+    st.button("Save Performance Data", on_click=save_table, args=("performance",))
   
 # -------------------------------  
 # 12. Module: Training Records  
@@ -480,8 +537,7 @@ elif module == "Training Records":
       
     # CSV Upload option  
     uploaded_training = st.file_uploader("Upload Training CSV", type="csv", key="training_upload")  
-    if uploaded_training is not None:  
-        st.session_state.training = load_from_uploaded_file(uploaded_training, training_columns)  
+    if uploaded_training is not None and upload_table("training", uploaded_training):
         st.success("Training data uploaded successfully!")  
       
     with st.form("training_form"):  
@@ -502,26 +558,59 @@ elif module == "Training Records":
             elif employee_id == "" or not employee_id.isdigit():  
                 st.error("Please enter a valid numeric Employee ID (up to 6 digits).")  
             else:  
-                new_training = pd.DataFrame({  
-                    "training_id": [training_id],  
-                    "employee_id": [employee_id],  
-                    "course_name": [course_name],  
-                    "start_date": [start_date.strftime('%Y-%m-%d')],  
-                    "end_date": [end_date.strftime('%Y-%m-%d')],  
-                    "status": [status],  
-                    "certification": [certification]  
-                })  
-                st.session_state.training = pd.concat([st.session_state.training, new_training], ignore_index=True)  
+                new_training = {  
+                    "training_id": training_id,  
+                    "employee_id": employee_id,  
+                    "course_name": course_name,  
+                    "start_date": start_date.strftime('%Y-%m-%d'),  
+                    "end_date": end_date.strftime('%Y-%m-%d'),  
+                    "status": status,  
+                    "certification": certification  
+                }  
+                st.session_state.training.upsert(new_training)
                 st.success("Training record added successfully!")  
       
     st.subheader("Training Records Table")  
-    st.dataframe(st.session_state.training)  
-    st.markdown(get_csv_download_link(st.session_state.training, "training.csv", "Download Training CSV"), unsafe_allow_html=True)  
-    if st.button("Save Training Data"):  
-        save_table("training", st.session_state.training)  
+    show_table_preview(st.session_state.training)
+    csv_download(st.session_state.training.frame, "training.csv", "Download Training CSV", key="training_export")  
+    st.button("Save Training Data", on_click=save_table, args=("training",))
   
+# -------------------------------
+# 13. Module: Search Notes
+# -------------------------------
+# Ranked full-text search over saved meeting notes and disciplinary records,
+# answered by SQLite's FTS5 indexes without loading either table.
+elif module == "Search Notes":
+    st.header("Search Notes")
+    if not get_storage().supports_sql:
+        st.info("Full-text search needs the SQLite storage backend.")
+        st.stop()
+
+    text = st.text_input("Search meeting notes and disciplinary records", placeholder="e.g. late attendance")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        sources = st.multiselect("Search In", SEARCH_TABLES, default=SEARCH_TABLES, format_func=str.capitalize)
+    with col2:
+        search_employee = st.text_input("Employee ID (optional)", max_chars=6)
+    with col3:
+        search_from = st.date_input("From (optional)", value=None)
+    with col4:
+        search_to = st.date_input("To (optional)", value=None)
+
+    hits = search(get_storage().query, text, sources, search_employee.strip(), search_from, search_to) if text.strip() else None
+    if hits is None:
+        st.caption("Searches saved records; words are matched in any order, the last one as a prefix.")
+    elif hits.empty:
+        st.info("No matching records.")
+    else:
+        st.caption(f"Top {len(hits)} match(es), best first")
+        for hit in hits.itertuples(index=False):
+            who = f"{hit.employee} ({hit.employee_id})" if hit.employee else f"Employee {hit.employee_id}"
+            st.markdown(f"**{hit.source.capitalize()} #{hit.record_id}** · {who} · {hit.date or 'no date'}")
+            st.markdown(highlight_markdown(hit.snippet))
+
 # -------------------------------  
-# 13. Module: Reports  
+# 14. Module: Reports  
 # -------------------------------  
 # -------------------------------  
 # Reports Module  
@@ -538,367 +627,53 @@ elif module == "Reports":
         date_to = st.date_input("To", datetime.date.today())  
   
     # Report type selection with new options  
-    report_type = st.selectbox(  
-        "Select Report Type",  
-        ["Employee Activity", "Department Performance", "Training Completion", "Meeting Frequency",  
-         "Employees by Employment Status", "Disciplinary Actions by Violations",   
-         "Disciplinary Actions per Employee", "Training per Employee",   
-         "Training Completion Status", "Performance per Employee"]  
-    )  
+    report_type = st.selectbox("Select Report Type", list(REPORT_TABLES))
   
-    # Grouping options (for applicable types)  
+    # Grouping options (for reports grouped per employee)
     grouping_options = st.multiselect(  
         "Group By",  
-        ["Employee", "Department", "Job Title"],  
+        list(GROUP_BY_COLUMNS),
         default=["Employee"]  
     )  
   
-    report_df = None  # This will hold the generated report  
-  
     if st.button("Generate Report"):  
-        if "employees" not in st.session_state or st.session_state.employees.empty:  
+        query = report_query(report_type)
+        if query is not None:
+            # Aggregated in SQLite: no table is loaded into the session
+            has_employees = bool(query("SELECT EXISTS (SELECT 1 FROM employees)").iloc[0, 0])
+        else:
+            load_tables(REPORT_TABLES[report_type])
+            has_employees = "employees" in st.session_state and not st.session_state.employees.empty
+        if not has_employees:
             st.error("No employee data available.")  
             st.stop()  
   
-        # Filter data by date range  
-        date_from_dt = pd.to_datetime(date_from)  
-        date_to_dt = pd.to_datetime(date_to)  
-  
-        # Original report types  
-        if report_type == "Employee Activity":  
-            if "activity" in st.session_state and not st.session_state.activity.empty:  
-                activity_df = st.session_state.activity.copy()  
-                activity_df['date'] = pd.to_datetime(activity_df['date'], errors='coerce')  
-                activity_df = activity_df[(activity_df['date'] >= date_from_dt) & (activity_df['date'] <= date_to_dt)]  
-      
-                if not activity_df.empty:  
-                    activity_with_emp = activity_df.merge(  
-                        st.session_state.employees[['employee_id', 'first_name', 'last_name', 'department', 'job_title']],  
-                        on='employee_id', how='left'  
-                    )  
-                    activity_with_emp['employee'] = activity_with_emp['first_name'] + " " + activity_with_emp['last_name']  
-                    report_df = activity_with_emp  
-                    st.dataframe(report_df)  
-                      
-                    # Simple bar chart: count of activities per employee  
-                    counts = report_df['employee'].value_counts().reset_index()  
-                    counts.columns = ['employee', 'Count']  
-                    fig, ax = plt.subplots(figsize=(12, 8))  
-                    ax.bar(counts['employee'], counts['Count'], color='#2563EB')  
-                    ax.set_xlabel("Employee", labelpad=10)  
-                    ax.set_ylabel("Activity Count", labelpad=10)  
-                    ax.set_title("Employee Activity Report", pad=15)  
-                    ax.set_axisbelow(True)  
-                    plt.xticks(rotation=45, ha='right')  
-                    plt.tight_layout()  
-                    st.pyplot(fig)  
-                else:  
-                    st.info("No employee activity data available for the selected date range.")  
-            else:  
-                st.info("No employee activity data available.")  
-      
-        elif report_type == "Department Performance":  
-            if "performance" in st.session_state and not st.session_state.performance.empty:  
-                perf_df = st.session_state.performance.copy()  
-                perf_df['date'] = pd.to_datetime(perf_df['date'], errors='coerce')  
-                perf_df = perf_df[(perf_df['date'] >= date_from_dt) & (perf_df['date'] <= date_to_dt)]  
-                  
-                if not perf_df.empty:  
-                    perf_with_emp = perf_df.merge(  
-                        st.session_state.employees[['employee_id', 'first_name', 'last_name', 'department']],  
-                        on='employee_id', how='left'  
-                    )  
-                      
-                    # Assuming there's a numeric performance metric column  
-                    numeric_cols = perf_with_emp.select_dtypes(include=['number']).columns.tolist()  
-                    if 'employee_id' in numeric_cols:  
-                        numeric_cols.remove('employee_id')  
-                      
-                    if numeric_cols:  
-                        dept_perf = perf_with_emp.groupby('department')[numeric_cols].mean().reset_index()  
-                        report_df = dept_perf  
-                        st.dataframe(report_df)  
-                          
-                        # Plot  
-                        fig, ax = plt.subplots(figsize=(12, 8))  
-                        ax.bar(dept_perf['department'], dept_perf[numeric_cols[0]], color='#2563EB')  
-                        ax.set_xlabel("Department", labelpad=10)  
-                        ax.set_ylabel(numeric_cols[0], labelpad=10)  
-                        ax.set_title("Department Performance", pad=15)  
-                        ax.set_axisbelow(True)  
-                        plt.xticks(rotation=45, ha='right')  
-                        plt.tight_layout()  
-                        st.pyplot(fig)  
-                    else:  
-                        st.info("No numeric performance metrics found in the data.")  
-                else:  
-                    st.info("No performance data found for the selected date range.")  
-            else:  
-                st.info("No performance data available.")  
-      
-        elif report_type == "Training Completion":  
-            if "training" in st.session_state and not st.session_state.training.empty:  
-                training_df = st.session_state.training.copy()  
-                training_df['date'] = pd.to_datetime(training_df['date'], errors='coerce')  
-                training_df = training_df[(training_df['date'] >= date_from_dt) & (training_df['date'] <= date_to_dt)]  
-                  
-                if not training_df.empty:  
-                    # Assuming there's a completion status column  
-                    if 'completion_status' in training_df.columns:  
-                        completion_counts = training_df['completion_status'].value_counts().reset_index()  
-                        completion_counts.columns = ['Status', 'Count']  
-                        report_df = completion_counts  
-                        st.dataframe(report_df)  
-                          
-                        # Plot  
-                        fig, ax = plt.subplots(figsize=(12, 8))  
-                        ax.bar(completion_counts['Status'], completion_counts['Count'], color='#2563EB')  
-                        ax.set_xlabel("Completion Status", labelpad=10)  
-                        ax.set_ylabel("Count", labelpad=10)  
-                        ax.set_title("Training Completion Status", pad=15)  
-                        ax.set_axisbelow(True)  
-                        plt.xticks(rotation=45, ha='right')  
-                        plt.tight_layout()  
-                        st.pyplot(fig)  
-                    else:  
-                        st.info("Completion status column not found in training data.")  
-                else:  
-                    st.info("No training data found for the selected date range.")  
-            else:  
-                st.info("No training data available.")  
-      
-        elif report_type == "Meeting Frequency":  
-            if "meetings" in st.session_state and not st.session_state.meetings.empty:  
-                meetings_df = st.session_state.meetings.copy()  
-                meetings_df['meeting_date'] = pd.to_datetime(meetings_df['meeting_date'], errors='coerce')  
-                meetings_df = meetings_df[(meetings_df['meeting_date'] >= date_from_dt) & (meetings_df['meeting_date'] <= date_to_dt)]  
-                  
-                if not meetings_df.empty:  
-                    # Add month column for grouping  
-                    meetings_df['month'] = meetings_df['meeting_date'].dt.strftime('%Y-%m')  
-                      
-                    meeting_freq = meetings_df.groupby('month').size().reset_index(name='Count')  
-                    report_df = meeting_freq  
-                    st.dataframe(report_df)  
-                      
-                    # Plot  
-                    fig, ax = plt.subplots(figsize=(12, 8))  
-                    ax.bar(meeting_freq['month'], meeting_freq['Count'], color='#2563EB')  
-                    ax.set_xlabel("Month", labelpad=10)  
-                    ax.set_ylabel("Number of Meetings", labelpad=10)  
-                    ax.set_title("Meeting Frequency by Month", pad=15)  
-                    ax.set_axisbelow(True)  
-                    plt.xticks(rotation=45, ha='right')  
-                    plt.tight_layout()  
-                    st.pyplot(fig)  
-                else:  
-                    st.info("No meetings found for the selected date range.")  
-            else:  
-                st.info("No meeting data available.")  
-                  
-        # New report types  
-        elif report_type == "Employees by Employment Status":  
-            if "employees" in st.session_state and not st.session_state.employees.empty:  
-                emp_df = st.session_state.employees.copy()  
-                # We assume employment status is stored in a column named 'employment_status'  
-                if "employment_status" in emp_df.columns:  
-                    status_counts = emp_df['employment_status'].value_counts().reset_index()  
-                    status_counts.columns = ['Employment Status', 'Count']  
-                    report_df = status_counts  
-                    st.dataframe(report_df)  
-                      
-                    # Plot  
-                    fig, ax = plt.subplots(figsize=(12, 8))  
-                    ax.bar(report_df['Employment Status'], report_df['Count'], color='#2563EB')  
-                    ax.set_xlabel("Employment Status", labelpad=10)  
-                    ax.set_ylabel("Number of Employees", labelpad=10)  
-                    ax.set_title("Employees by Employment Status", pad=15)  
-                    ax.set_axisbelow(True)  
-                    plt.xticks(rotation=45, ha='right')  
-                    plt.tight_layout()  
-                    st.pyplot(fig)  
-                else:  
-                    st.info("Employment status column not found in employee data.")  
-            else:  
-                st.info("No employee data available.")  
-                  
-        elif report_type == "Disciplinary Actions by Violations":  
-            if "disciplinary" in st.session_state and not st.session_state.disciplinary.empty:  
-                disc_df = st.session_state.disciplinary.copy()  
-                disc_df['date'] = pd.to_datetime(disc_df['date'], errors='coerce')  
-                disc_df = disc_df[(disc_df['date'] >= date_from_dt) & (disc_df['date'] <= date_to_dt)]  
-                  
-                if not disc_df.empty:  
-                    # Count violations by type  
-                    violation_counts = disc_df['violation_type'].value_counts().reset_index()  
-                    violation_counts.columns = ['Violation Type', 'Count']  
-                    report_df = violation_counts  
-                    st.dataframe(report_df)  
-                      
-                    # Plot  
-                    fig, ax = plt.subplots(figsize=(12, 8))  
-                    ax.bar(report_df['Violation Type'], report_df['Count'], color='#2563EB')  
-                    ax.set_xlabel("Violation Type", labelpad=10)  
-                    ax.set_ylabel("Number of Incidents", labelpad=10)  
-                    ax.set_title("Disciplinary Actions by Violation Type", pad=15)  
-                    ax.set_axisbelow(True)  
-                    plt.xticks(rotation=45, ha='right')  
-                    plt.tight_layout()  
-                    st.pyplot(fig)  
-                else:  
-                    st.info("No disciplinary actions found for the selected date range.")  
-            else:  
-                st.info("No disciplinary data available.")  
-                  
-        elif report_type == "Disciplinary Actions per Employee":  
-            if "disciplinary" in st.session_state and not st.session_state.disciplinary.empty:  
-                disc_df = st.session_state.disciplinary.copy()  
-                disc_df['date'] = pd.to_datetime(disc_df['date'], errors='coerce')  
-                disc_df = disc_df[(disc_df['date'] >= date_from_dt) & (disc_df['date'] <= date_to_dt)]  
-                  
-                if not disc_df.empty:  
-                    # Merge with employee data  
-                    disc_with_emp = disc_df.merge(  
-                        st.session_state.employees[['employee_id', 'first_name', 'last_name']],  
-                        on='employee_id', how='left'  
-                    )  
-                    disc_with_emp['employee'] = disc_with_emp['first_name'] + " " + disc_with_emp['last_name']  
-                      
-                    # Count actions per employee  
-                    emp_counts = disc_with_emp['employee'].value_counts().reset_index()  
-                    emp_counts.columns = ['Employee', 'Count']  
-                    report_df = emp_counts  
-                    st.dataframe(report_df)  
-                      
-                    # Plot  
-                    fig, ax = plt.subplots(figsize=(12, 8))  
-                    ax.bar(report_df['Employee'], report_df['Count'], color='#2563EB')  
-                    ax.set_xlabel("Employee", labelpad=10)  
-                    ax.set_ylabel("Number of Disciplinary Actions", labelpad=10)  
-                    ax.set_title("Disciplinary Actions per Employee", pad=15)  
-                    ax.set_axisbelow(True)  
-                    plt.xticks(rotation=45, ha='right')  
-                    plt.tight_layout()  
-                    st.pyplot(fig)  
-                else:  
-                    st.info("No disciplinary actions found for the selected date range.")  
-            else:  
-                st.info("No disciplinary data available.")  
-                  
-        elif report_type == "Training per Employee":  
-            if "training" in st.session_state and not st.session_state.training.empty:  
-                train_df = st.session_state.training.copy()  
-                train_df['date'] = pd.to_datetime(train_df['date'], errors='coerce')  
-                train_df = train_df[(train_df['date'] >= date_from_dt) & (train_df['date'] <= date_to_dt)]  
-                  
-                if not train_df.empty:  
-                    # Merge with employee data  
-                    train_with_emp = train_df.merge(  
-                        st.session_state.employees[['employee_id', 'first_name', 'last_name']],  
-                        on='employee_id', how='left'  
-                    )  
-                    train_with_emp['employee'] = train_with_emp['first_name'] + " " + train_with_emp['last_name']  
-                      
-                    # Count trainings per employee  
-                    emp_counts = train_with_emp['employee'].value_counts().reset_index()  
-                    emp_counts.columns = ['Employee', 'Count']  
-                    report_df = emp_counts  
-                    st.dataframe(report_df)  
-                      
-                    # Plot  
-                    fig, ax = plt.subplots(figsize=(12, 8))  
-                    ax.bar(report_df['Employee'], report_df['Count'], color='#2563EB')  
-                    ax.set_xlabel("Employee", labelpad=10)  
-                    ax.set_ylabel("Number of Trainings", labelpad=10)  
-                    ax.set_title("Training per Employee", pad=15)  
-                    ax.set_axisbelow(True)  
-                    plt.xticks(rotation=45, ha='right')  
-                    plt.tight_layout()  
-                    st.pyplot(fig)  
-                else:  
-                    st.info("No training data found for the selected date range.")  
-            else:  
-                st.info("No training data available.")  
-                  
-        elif report_type == "Training Completion Status":  
-            if "training" in st.session_state and not st.session_state.training.empty:  
-                train_df = st.session_state.training.copy()  
-                train_df['date'] = pd.to_datetime(train_df['date'], errors='coerce')  
-                train_df = train_df[(train_df['date'] >= date_from_dt) & (train_df['date'] <= date_to_dt)]  
-                  
-                if not train_df.empty:  
-                    # Expecting a column 'completion_status' in training data indicating completion status  
-                    if "completion_status" in train_df.columns:  
-                        status_counts = train_df['completion_status'].value_counts().reset_index()  
-                        status_counts.columns = ['Completion Status', 'Count']  
-                        report_df = status_counts  
-                        st.dataframe(report_df)  
-                          
-                        # Plot  
-                        fig, ax = plt.subplots(figsize=(12, 8))  
-                        ax.bar(report_df['Completion Status'], report_df['Count'], color='#2563EB')  
-                        ax.set_xlabel("Completion Status", labelpad=10)  
-                        ax.set_ylabel("Count", labelpad=10)  
-                        ax.set_title("Training Completion Status", pad=15)  
-                        ax.set_axisbelow(True)  
-                        plt.xticks(rotation=45, ha='right')  
-                        plt.tight_layout()  
-                        st.pyplot(fig)  
-                    else:  
-                        st.info("Completion status column not found in training data.")  
-                else:  
-                    st.info("No training data found for the selected date range.")  
-            else:  
-                st.info("No training data available.")  
-                  
-        elif report_type == "Performance per Employee":  
-            if "performance" in st.session_state and not st.session_state.performance.empty:  
-                perf_df = st.session_state.performance.copy()  
-                perf_df['date'] = pd.to_datetime(perf_df['date'], errors='coerce')  
-                perf_df = perf_df[(perf_df['date'] >= date_from_dt) & (perf_df['date'] <= date_to_dt)]  
-                  
-                if not perf_df.empty:  
-                    # Merge with employee data  
-                    perf_with_emp = perf_df.merge(  
-                        st.session_state.employees[['employee_id', 'first_name', 'last_name']],  
-                        on='employee_id', how='left'  
-                    )  
-                    perf_with_emp['employee'] = perf_with_emp['first_name'] + " " + perf_with_emp['last_name']  
-                      
-                    # Find numeric performance metrics  
-                    numeric_cols = perf_with_emp.select_dtypes(include=['number']).columns.tolist()  
-                    if 'employee_id' in numeric_cols:  
-                        numeric_cols.remove('employee_id')  
-                      
-                    if numeric_cols:  
-                        # Calculate average performance metrics per employee  
-                        report_df = perf_with_emp.groupby('employee')[numeric_cols].mean().reset_index()  
-                        st.dataframe(report_df)  
-                          
-                        # Plot  
-                        fig, ax = plt.subplots(figsize=(12, 8))  
-                        ax.bar(report_df['employee'], report_df[numeric_cols[0]], color='#2563EB')  
-                        ax.set_xlabel("Employee", labelpad=10)  
-                        ax.set_ylabel(numeric_cols[0], labelpad=10)  
-                        ax.set_title("Performance per Employee", pad=15)  
-                        ax.set_axisbelow(True)  
-                        plt.xticks(rotation=45, ha='right')  
-                        plt.tight_layout()  
-                        st.pyplot(fig)  
-                    else:  
-                        st.info("No numeric performance metrics found in the data.")  
-                else:  
-                    st.info("No performance data found for the selected date range.")  
-            else:  
-                st.info("No performance data available.")  
+        report_df = get_report_engine().run(
+            report_type,
+            lambda table_name: st.session_state[table_name].frame(),
+            # Only the in-memory path joins names through the index; SQL joins employees itself
+            None if query is not None else get_employee_index().annotate,
+            tuple(grouping_options),
+            date_from,
+            date_to,
+            report_versions(report_type),
+            query,
+        )
+        if report_df is None:
+            st.info("No data found for the selected report and date range.")
+        else:
+            st.dataframe(report_df)
+            plot_report(report_df, report_type)
+
+        # Keep the generated report across reruns so it can be exported
+        st.session_state.report_df = report_df
   
     # Export options  
     st.subheader("Export Report")  
-    if st.button("Export to CSV"):  
-        if 'report_df' in locals() and report_df is not None:  
-            csv = report_df.to_csv(index=False)  
-            b64 = base64.b64encode(csv.encode()).decode()  
-            href = f'<a href="data:file/csv;base64,{b64}" download="report.csv">Download CSV File</a>'  
-            st.markdown(href, unsafe_allow_html=True)  
-        else:  
-            st.error("No report data to export.")  
+    if st.session_state.get("report_df") is not None:
+        report_df = st.session_state.report_df
+        csv_download(lambda: report_df, "report.csv", "Export to CSV", key="report_export")
+    else:
+        st.info("Generate a report to export it.")
+
+log_rerun_time(rerun_started, module)
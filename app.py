@@ -1,79 +1,29 @@
 import streamlit as st  
 import pandas as pd  
-import sqlite3  
+from sqlite_pool import ConnectionManager
+from chart_data import downsample_series
+from exports import build_csv_export, export_file_name, export_mime
+from overtime import (
+    DB_NAME, ENTRY_COLUMNS, PAGE_SIZE, delete_entry, export_chunks, fetch_page, import_data, init_db, insert_entry,
+    report_aggregates, report_date_span, search_entries,
+)
+from timing import log_rerun_time
 from datetime import datetime  
 import io  
+import time
+from functools import partial
   
+rerun_started = time.perf_counter()
+
 # --- CONFIGURATION ---  
 st.set_page_config(page_title="Overtime Management App", page_icon="🕒", layout="wide")  
-DB_NAME = "overtime_app.db"  
-TABLE_NAME = "overtime_entries"  
-  
-# --- DATABASE FUNCTIONS ---  
-def init_db():  
-    conn = sqlite3.connect(DB_NAME)  
-    c = conn.cursor()  
-    c.execute(f"""  
-        CREATE TABLE IF NOT EXISTS {TABLE_NAME} (  
-            entry_id INTEGER PRIMARY KEY AUTOINCREMENT,  
-            date TEXT,  
-            week_start TEXT,  
-            week_end TEXT,  
-            employee_id TEXT,  
-            name TEXT,  
-            department TEXT,  
-            roster_group TEXT,  
-            overtime_type TEXT,  
-            hours REAL,  
-            depot TEXT,  
-            notes TEXT,  
-            reviewed_by TEXT,  
-            audit_status TEXT,  
-            discrepancy_comments TEXT  
-        )  
-    """)  
-    conn.commit()  
-    conn.close()  
-  
-def insert_entry(entry):  
-    conn = sqlite3.connect(DB_NAME)  
-    c = conn.cursor()  
-    c.execute(f"""  
-        INSERT INTO {TABLE_NAME} (  
-            date, week_start, week_end, employee_id, name, department, roster_group,  
-            overtime_type, hours, depot, notes, reviewed_by, audit_status, discrepancy_comments  
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)  
-    """, (  
-        entry['date'], entry['week_start'], entry['week_end'], entry['employee_id'], entry['name'],  
-        entry['department'], entry['roster_group'], entry['overtime_type'], entry['hours'],  
-        entry['depot'], entry['notes'], entry['reviewed_by'], entry['audit_status'], entry['discrepancy_comments']  
-    ))  
-    conn.commit()  
-    conn.close()  
-  
-def fetch_entries(department=None):  
-    conn = sqlite3.connect(DB_NAME)  
-    query = f"SELECT * FROM {TABLE_NAME}"  
-    params = ()  
-    if department:  
-        query += " WHERE department = ?"  
-        params = (department,)  
-    df = pd.read_sql_query(query, conn, params=params)  
-    conn.close()  
-    return df  
-  
-def import_data(uploaded_file):  
-    df = pd.read_csv(uploaded_file)  
-    conn = sqlite3.connect(DB_NAME)  
-    df.to_sql(TABLE_NAME, conn, if_exists='append', index=False)  
-    conn.close()  
-  
-def delete_entry(entry_id):  
-    conn = sqlite3.connect(DB_NAME)  
-    c = conn.cursor()  
-    c.execute(f"DELETE FROM {TABLE_NAME} WHERE entry_id = ?", (entry_id,))  
-    conn.commit()  
-    conn.close()  
+
+@st.cache_resource
+def get_db():
+    """Process-wide SQLite connection manager shared by every session; the schema is bootstrapped once, here"""
+    db = ConnectionManager(DB_NAME)
+    init_db(db)
+    return db
   
 # --- TWO-PAGE FORM ---  
 def entry_form(department):  
@@ -119,84 +69,130 @@ def entry_form(department):
                 "audit_status": audit_status,  
                 "discrepancy_comments": discrepancy_comments  
             })  
-            insert_entry(entry)  
+            insert_entry(get_db(), entry)
             st.success("Entry added!")  
             st.session_state["show_page2_" + department] = False  
   
+# --- PAGED ENTRY VIEW ---
+def paged_entries_view(key, department=None):
+    """Show one keyset page of entries with Newer/Older controls; returns False if there are none"""
+    cursors = st.session_state.setdefault("page_cursors_" + key, [])
+    before_id = cursors[-1] if cursors else None
+    # Fetch one extra row to know whether an older page exists
+    df = fetch_page(get_db(), department, before_id, PAGE_SIZE + 1)
+    if df.empty and not cursors:
+        return False
+    has_older = len(df) > PAGE_SIZE
+    df = df.head(PAGE_SIZE)
+    st.dataframe(df)
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        if cursors and st.button("◀ Newer", key="page_newer_" + key):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        if has_older and st.button("Older ▶", key="page_older_" + key):
+            cursors.append(int(df['entry_id'].iloc[-1]))
+            st.rerun()
+    with col3:
+        st.caption(f"Page {len(cursors) + 1}")
+    return True
+
 # --- DEPARTMENT TAB WITH DELETE ---  
 def department_tab(dept):  
     st.subheader(dept + " Overtime Entries")  
-    df = fetch_entries(dept)  
-    st.dataframe(df.tail(20))  
+    has_entries = paged_entries_view(dept, dept)
     st.markdown("---")  
     # Record deletion UI  
-    if not df.empty:  
+    if has_entries:
         st.markdown("#### Delete a Record")  
-        entry_ids = df['entry_id'].tolist()  
-        selected_id = st.selectbox("Select Entry ID to Delete", entry_ids, key="delete_select_" + dept)  
-        if st.button("Delete Selected Entry", key="delete_btn_" + dept):  
-            delete_entry(selected_id)  
-            st.success("Entry deleted!")  
-            st.experimental_rerun()  
+        term = st.text_input("Search by Entry ID, Employee ID or Name", key="delete_search_" + dept)
+        matches = search_entries(get_db(), dept, term)
+        if matches:
+            labels = {row[0]: f"{row[0]} — {row[1]} — {row[2]} {row[3]}" for row in matches}
+            selected_id = st.selectbox("Select Entry ID to Delete", list(labels), format_func=labels.get, key="delete_select_" + dept)
+            if st.button("Delete Selected Entry", key="delete_btn_" + dept):  
+                delete_entry(get_db(), selected_id)
+                st.success("Entry deleted!")  
+                st.rerun()  
+        else:
+            st.info("No matching entries.")
     entry_form(dept)  
   
 # --- SUMMARY TAB ---  
 def summary_tab():  
     st.header("Summary")  
-    df = fetch_entries()  
-    if not df.empty:  
-        st.dataframe(df.tail(20))  
-    else:  
+    if not paged_entries_view("summary"):
         st.info("No entries yet.")  
   
 # --- REPORT MODULE ---  
 def report_tab():  
     st.subheader("Reports & Visualizations")  
-    df = fetch_entries()  
-    if df.empty:  
+    first, last = report_date_span(get_db())
+    if first is None:
         st.info("No data available for reporting.")  
         return  
+    col1, col2 = st.columns(2)
+    with col1:
+        date_from = st.date_input("From", pd.Timestamp(first).date(), key="report_from")
+    with col2:
+        date_to = st.date_input("To", pd.Timestamp(last).date(), key="report_to")
+    by_department, trend, audit, pivot = report_aggregates(get_db(), date_from, date_to)
+    if trend.empty:
+        st.info("No entries in the selected date range.")
+        return
     st.write("**Total Overtime Hours by Department**")  
-    st.bar_chart(df.groupby("department")["hours"].sum())  
+    st.bar_chart(by_department.set_index("department")["hours"])
     st.write("**Overtime Hours Trend**")  
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')  
-    trend = df.groupby("date")["hours"].sum().sort_index()  
-    st.line_chart(trend)  
+    st.line_chart(downsample_series(trend.set_index("date")["hours"]))
     st.write("**Audit Status Distribution**")  
-    st.dataframe(df["audit_status"].value_counts())  
+    st.dataframe(audit.set_index("audit_status")["count"])
     st.write("**Department & Audit Status Pivot Table**")  
-    pivot = pd.pivot_table(df, values="hours", index="department", columns="audit_status", aggfunc="sum", fill_value=0)  
     st.dataframe(pivot)  
   
 # --- IMPORT/EXPORT MODULE ---  
 def import_export_tab():  
     st.subheader("Import/Export Data")  
-    # Export  
-    df = fetch_entries()  
-    csv = df.to_csv(index=False).encode("utf-8")  
-    st.download_button("Download Data as CSV", data=csv, file_name="overtime_data.csv", mime="text/csv")  
+    # Export: built only when the button is clicked (on a separate thread), streamed from SQLite in chunks
+    compress = st.checkbox("gzip", key="export_gzip")
+    db = get_db()
+    st.download_button(
+        "Download Data as CSV",
+        data=lambda: build_csv_export(export_chunks(db), compress),
+        file_name=export_file_name("overtime_data.csv", compress),
+        mime=export_mime(compress),
+        on_click="ignore",
+    )
     # Import  
     uploaded_file = st.file_uploader("Upload CSV to Import Data", type=["csv"])  
-    if uploaded_file is not None:  
-        import_data(uploaded_file)  
-        st.success("Data imported successfully! Please refresh the page to see updates.")  
+    if uploaded_file is not None and st.button("Import CSV"):
+        progress_bar = st.progress(0.0)
+        try:
+            inserted, rejected_count, rejected = import_data(get_db(), uploaded_file, progress_bar.progress)
+        except Exception as e:
+            st.error(f"Import failed, no rows were written: {e}")
+        else:
+            progress_bar.progress(1.0)
+            st.success(f"Imported {inserted} rows.")
+            if rejected_count:
+                st.warning(f"{rejected_count} rows were rejected. First {len(rejected)} shown below.")
+                st.dataframe(rejected[["line", "reason"] + ENTRY_COLUMNS])
   
 # --- MAIN APP ---  
-init_db()  
 st.title("Employee Overtime & Uncovered Duties Tool")  
-tabs = st.tabs(["Summary", "Planning", "Ops", "OCC", "Training", "Reports", "Import/Export"])  
-  
-with tabs[0]:  
-    summary_tab()  
-with tabs[1]:  
-    department_tab("Planning")  
-with tabs[2]:  
-    department_tab("Ops")  
-with tabs[3]:  
-    department_tab("OCC")  
-with tabs[4]:  
-    department_tab("Training")  
-with tabs[5]:  
-    report_tab()  
-with tabs[6]:  
-    import_export_tab()  
+# Only the selected tab's view runs; switching tabs reruns the script
+TAB_VIEWS = {
+    "Summary": summary_tab,
+    "Planning": partial(department_tab, "Planning"),
+    "Ops": partial(department_tab, "Ops"),
+    "OCC": partial(department_tab, "OCC"),
+    "Training": partial(department_tab, "Training"),
+    "Reports": report_tab,
+    "Import/Export": import_export_tab,
+}
+tabs = st.tabs(list(TAB_VIEWS), key="overtime_tab", on_change="rerun")
+for tab, view in zip(tabs, TAB_VIEWS.values()):
+    if tab.open:
+        with tab:
+            view()
+log_rerun_time(rerun_started, "overtime app")
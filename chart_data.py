@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# Chart Data Reduction
+# -------------------------------
+# Charts get a bounded number of marks whatever the size of the data:
+# categorical charts keep the top N groups plus one "Other" bar, and time
+# series are downsampled with Largest-Triangle-Three-Buckets (LTTB), which
+# keeps the visual peaks and troughs a plain stride would drop.
+CHART_TOP_N = 20
+CHART_POINTS = 500
+
+
+def top_n(df, label_columns, value_column, n=CHART_TOP_N, other_agg="sum"):
+    """The n-1 largest rows by value plus an "Other" row aggregating the rest with `other_agg`.
+
+    Frames with at most n rows are returned unchanged."""
+    if len(df) <= n:
+        return df
+    ranked = df.sort_values(value_column, ascending=False, kind="stable")
+    head, rest = ranked.iloc[:n - 1], ranked.iloc[n - 1:]
+    other = {col: "" for col in label_columns}
+    other[label_columns[0]] = f"Other ({len(rest)})"
+    other[value_column] = rest[value_column].agg(other_agg)
+    return pd.concat([head.astype({col: object for col in label_columns}), pd.DataFrame([other])], ignore_index=True)
+
+
+def lttb_indices(x, y, threshold):
+    """Positions of the points LTTB keeps out of (x, y), first and last included"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    every = (n - 2) / (threshold - 2)
+    keep = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(areas.argmax())
+        keep.append(a)
+    keep.append(n - 1)
+    return np.array(keep)
+
+
+def downsample_series(series, points=CHART_POINTS):
+    """At most `points` points of a series (numeric or datetime index), chosen with LTTB"""
+    if len(series) <= points:
+        return series
+    index = series.index
+    x = index.asi8.astype(float) if isinstance(index, pd.DatetimeIndex) else np.arange(len(series), dtype=float)
+    y = pd.to_numeric(series, errors="coerce").fillna(0).to_numpy(dtype=float)
+    return series.iloc[lttb_indices(x, y, points)]
@@ -0,0 +1,88 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# -------------------------------
+# Chart Rendering Service
+# -------------------------------
+# Charts are drawn on standalone Figure objects with the Agg canvas, never
+# through pyplot, so nothing is kept in pyplot's global figure registry. Each
+# figure is cleared as soon as its PNG/SVG bytes are written. The bytes are
+# cached by a hash of the chart data, labels, style and format, so showing
+# the same chart again costs a dict lookup. matplotlib itself is imported on
+# the first render, so pages and batch jobs without charts never load it.
+CHART_STYLE = {"figsize": (12, 8), "dpi": 100, "color": "#2563EB"}
+CHART_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+def chart_key(df, *parts):
+    """Stable hash of a frame's contents and columns plus any labels/style parts"""
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    digest.update(repr((list(df.columns),) + parts).encode())
+    return digest.hexdigest()
+
+
+def render_bar_chart(labels, values, title, xlabel, ylabel, fmt="png", style=CHART_STYLE):
+    """Render a bar chart to PNG or SVG bytes on a standalone figure, then free the figure"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=style["figsize"], dpi=style["dpi"])
+    FigureCanvasAgg(fig)
+    try:
+        ax = fig.add_subplot()
+        positions = range(len(labels))
+        ax.bar(positions, values, color=style["color"])
+        ax.set_xticks(positions, labels, rotation=45, ha="right")
+        ax.set_xlabel(xlabel, labelpad=10)
+        ax.set_ylabel(ylabel, labelpad=10)
+        ax.set_title(title, pad=15)
+        ax.set_axisbelow(True)
+        fig.tight_layout()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt)
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+
+class ChartService:
+    """Renders charts and keeps their bytes in an LRU cache bounded by total size"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, style=CHART_STYLE):
+        self.max_bytes = max_bytes
+        self.style = style
+        self._lock = threading.Lock()
+        self._charts = OrderedDict()
+        self._size = 0
+
+    def _get(self, key):
+        with self._lock:
+            data = self._charts.get(key)
+            if data is not None:
+                self._charts.move_to_end(key)
+            return data
+
+    def _put(self, key, data):
+        with self._lock:
+            if key in self._charts:
+                return
+            self._charts[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and len(self._charts) > 1:
+                _, evicted = self._charts.popitem(last=False)
+                self._size -= len(evicted)
+
+    def bar_chart(self, df, label_columns, value_column, title, ylabel, fmt="png"):
+        """Bar chart bytes of `value_column` against the joined `label_columns` of a frame"""
+        key = chart_key(df[label_columns + [value_column]], "bar", title, ylabel, fmt, sorted(self.style.items()))
+        data = self._get(key)
+        if data is None:
+            labels = [" / ".join(part for part in parts if part) for parts in df[label_columns].astype(str).itertuples(index=False)]
+            data = render_bar_chart(labels, df[value_column].tolist(), title, " / ".join(label_columns), ylabel, fmt, self.style)
+            self._put(key, data)
+        return data
@@ -0,0 +1,123 @@
+import pandas as pd
+
+# -------------------------------
+# Typed Column Schemas
+# -------------------------------
+# Tables are stored as text but held in memory typed, so each table is cast
+# once when it is loaded: low-cardinality labels become categoricals (int8
+# codes plus one copy of each label), IDs and counts become nullable
+# integers, measures become floats and dates become datetime64. A column
+# whose values would not survive the cast (e.g. a non-numeric ID in an
+# uploaded CSV, or "007" whose leading zeros an integer would drop) is left
+# as text rather than losing data.
+#
+# Column kinds: "id", "int", "float", "category", "date" and "text" (default).
+SQL_TYPES = {"int": "INTEGER", "float": "REAL"}
+DATE_FORMAT = "%Y-%m-%d"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def sql_type(kind):
+    """SQLite column type (affinity) for a column kind"""
+    return SQL_TYPES.get(kind, "TEXT")
+
+
+def _present(series):
+    """Values that are neither missing nor blank"""
+    if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        return series.notna() & (series.astype("string").str.strip() != "")
+    return series.notna()
+
+
+def _lossless(converted, series):
+    return not (converted.isna() & _present(series)).any()
+
+
+def _as_number(series, kind):
+    if pd.api.types.is_numeric_dtype(series.dtype) and kind == "float":
+        return series.astype("float64")
+    numbers = pd.to_numeric(series.where(_present(series)), errors="coerce")
+    if not _lossless(numbers, series):
+        return series
+    if kind == "float":
+        return numbers.astype("float64")
+    whole = numbers.dropna()
+    if not (whole == whole.round()).all():
+        # Fractional values (e.g. a 3.5 score) stay numeric, as floats
+        return numbers.astype("float64") if kind == "int" else series
+    if kind == "id" and not _round_trips(numbers, series):
+        # Leading zeros, signs or spacing are part of an ID ("007" is not 7)
+        return series
+    return numbers.astype("Int64")
+
+
+def _round_trips(numbers, series):
+    """True if each present value reads back exactly as written once cast to an integer"""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return True
+    present = _present(series)
+    written = series[present].astype("string").str.strip()
+    return bool((numbers[present].astype("Int64").astype("string") == written).all())
+
+
+def _as_date(series):
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series
+    dates = pd.to_datetime(series.where(_present(series)), errors="coerce", format="ISO8601")
+    return dates if _lossless(dates, series) else series
+
+
+def _as_category(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    return series.astype("category")
+
+
+def cast_column(series, kind):
+    """Cast one column to its declared kind, leaving it unchanged if that would lose values"""
+    if kind in ("id", "int", "float"):
+        return _as_number(series, kind)
+    if kind == "date":
+        return _as_date(series)
+    if kind == "category":
+        return _as_category(series)
+    return series
+
+
+def apply_types(df, types):
+    """Copy of df with each column in `types` (column -> kind) cast to its kind"""
+    casts = {col: cast_column(df[col], kind) for col, kind in types.items() if col in df.columns}
+    return df.assign(**casts) if casts else df
+
+
+def concat_typed(frames):
+    """pd.concat that keeps categorical columns categorical (categories are unioned)"""
+    frames = [df for df in frames if len(df)] or frames[:1]
+    categorical = {col for df in frames for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)}
+    for col in categorical:
+        labels = pd.Index([])
+        for df in frames:
+            values = df[col].cat.categories if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].dropna().unique()
+            labels = labels.union(pd.Index(values, dtype=object), sort=False)
+        dtype = pd.CategoricalDtype(labels)
+        frames = [df.assign(**{col: df[col].astype(dtype)}) for df in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def format_dates(series):
+    """A datetime column as ISO text: the date alone at midnight, otherwise with its time of day"""
+    text = series.dt.strftime(DATE_FORMAT)
+    timed = series.notna() & (series != series.dt.normalize())
+    if timed.any():
+        text = text.where(~timed, series.dt.strftime(TIMESTAMP_FORMAT))
+        fractional = timed & (series.dt.microsecond != 0)
+        text = text.where(~fractional, series.dt.strftime(TIMESTAMP_FORMAT + ".%f"))
+    return text
+
+
+def storage_rows(df):
+    """Rows of df as plain Python values for SQLite: dates as ISO text, missing values as None"""
+    dates = {col: format_dates(df[col]) for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col].dtype)}
+    if dates:
+        df = df.assign(**dates)
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
@@ -0,0 +1,166 @@
+import argparse
+import datetime
+import os
+import sys
+import time
+
+import overtime
+from reports import GROUP_BY_COLUMNS, REPORTS, run_report
+from sqlite_pool import ConnectionManager, vacuum
+from storage import TABLES, import_table, open_storage, read_csv_table
+
+# -------------------------------
+# Headless Command Line
+# -------------------------------
+# Batch entry point over the same storage, import and report code the apps
+# use, without importing Streamlit or starting a UI:
+#   python employee_db.py report --type "Meeting Frequency" --from 2024-01-01 --to 2024-12-31 --out meetings.csv
+#   python employee_db.py import --table employees --file employees.csv
+#   python employee_db.py overtime-report --table trend --from 2024-01-01 --to 2024-12-31 --out trend.csv
+#   python employee_db.py overtime-import --file entries.csv
+#   python employee_db.py vacuum --db employee_database.db
+# Results go to --out (CSV, or Parquet/JSON by extension; stdout by default)
+# and the time each command took goes to stderr, so runs can be benchmarked.
+EMPLOYEE_DB = "employee_database.db"
+DATA_DIR = "data"
+OVERTIME_TABLES = ["by_department", "trend", "audit", "pivot"]
+
+
+def write_frame(df, out):
+    """Write a frame to a CSV/Parquet/JSON file chosen by extension, or as CSV to stdout"""
+    if not out or out == "-":
+        df.to_csv(sys.stdout, index=False)
+    elif out.endswith(".parquet"):
+        df.to_parquet(out, index=False)
+    elif out.endswith(".json"):
+        df.to_json(out, orient="records", date_format="iso")
+    else:
+        df.to_csv(out, index=False)
+
+
+def employee_location(args):
+    return args.db if args.backend == "sqlite" else args.data_dir
+
+
+def employee_storage(args):
+    return open_storage(args.backend, employee_location(args))
+
+
+def missing(path):
+    """Report a missing database or data directory; read commands stop there instead of creating an empty one"""
+    if os.path.exists(path):
+        return False
+    print(f"No such database: {path}", file=sys.stderr)
+    return True
+
+
+def report_command(args):
+    if missing(employee_location(args)):
+        return 1
+    result = run_report(employee_storage(args), args.type, tuple(args.group_by), args.date_from, args.date_to)
+    if result is None:
+        print("No data found for the selected report and date range.", file=sys.stderr)
+        return 0
+    write_frame(result, args.out)
+    if args.chart:
+        from charts import ChartService
+
+        keys, value = list(result.columns[:-1]), result.columns[-1]
+        fmt = "svg" if args.chart.endswith(".svg") else "png"
+        with open(args.chart, "wb") as f:
+            f.write(ChartService().bar_chart(result, keys, value, args.type, REPORTS[args.type]["ylabel"], fmt))
+    return 0
+
+
+def import_command(args):
+    result = import_table(employee_storage(args), args.table, read_csv_table(args.table, args.file), args.replace)
+    if result.conflicts:
+        print(f"Not imported: {len(result.conflicts)} record(s) changed while importing; run it again.", file=sys.stderr)
+        return 1
+    print(f"{args.table}: {result.upserted} upserted, {result.deleted} deleted", file=sys.stderr)
+    return 0
+
+
+def overtime_report_command(args):
+    if missing(args.db):
+        return 1
+    db = ConnectionManager(args.db)
+    overtime.init_db(db)
+    tables = dict(zip(OVERTIME_TABLES, overtime.report_aggregates(db, args.date_from, args.date_to)))
+    write_frame(tables[args.table].reset_index() if args.table == "pivot" else tables[args.table], args.out)
+    return 0
+
+
+def overtime_import_command(args):
+    db = ConnectionManager(args.db)
+    overtime.init_db(db)
+    inserted, rejected_count, rejected = overtime.import_data(db, args.file)
+    print(f"Imported {inserted} rows, rejected {rejected_count}.", file=sys.stderr)
+    if rejected_count and args.rejected:
+        write_frame(rejected, args.rejected)
+    return 0
+
+
+def vacuum_command(args):
+    vacuum(ConnectionManager(args.db))
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="employee-db", description="Employee records and overtime batch jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def employee_options(command):
+        command.add_argument("--backend", choices=["sqlite", "parquet", "arrow"], default="sqlite")
+        command.add_argument("--db", default=EMPLOYEE_DB, help="SQLite database file (sqlite backend)")
+        command.add_argument("--data-dir", default=DATA_DIR, help="snapshot directory (parquet/arrow backends)")
+
+    def date_range(command):
+        command.add_argument("--from", dest="date_from", type=datetime.date.fromisoformat, required=True)
+        command.add_argument("--to", dest="date_to", type=datetime.date.fromisoformat, required=True)
+
+    report = commands.add_parser("report", help="run an employee report")
+    report.add_argument("--type", choices=list(REPORTS), required=True)
+    report.add_argument("--group-by", nargs="*", choices=list(GROUP_BY_COLUMNS), default=["Employee"])
+    date_range(report)
+    report.add_argument("--out", help="output file (.csv, .parquet or .json); stdout if omitted")
+    report.add_argument("--chart", help="also render the chart to a .png or .svg file")
+    employee_options(report)
+    report.set_defaults(run=report_command)
+
+    load = commands.add_parser("import", help="import a CSV into an employee table")
+    load.add_argument("--table", choices=TABLES, required=True)
+    load.add_argument("--file", required=True)
+    load.add_argument("--replace", action="store_true", help="delete rows that are not in the file")
+    employee_options(load)
+    load.set_defaults(run=import_command)
+
+    overtime_report = commands.add_parser("overtime-report", help="run an overtime report")
+    overtime_report.add_argument("--table", choices=OVERTIME_TABLES, default="by_department")
+    date_range(overtime_report)
+    overtime_report.add_argument("--out", help="output file (.csv, .parquet or .json); stdout if omitted")
+    overtime_report.add_argument("--db", default=overtime.DB_NAME)
+    overtime_report.set_defaults(run=overtime_report_command)
+
+    overtime_import = commands.add_parser("overtime-import", help="import a CSV of overtime entries")
+    overtime_import.add_argument("--file", required=True)
+    overtime_import.add_argument("--rejected", help="write a sample of rejected rows to this file")
+    overtime_import.add_argument("--db", default=overtime.DB_NAME)
+    overtime_import.set_defaults(run=overtime_import_command)
+
+    compact = commands.add_parser("vacuum", help="compact a SQLite database and rebuild its full-text indexes")
+    compact.add_argument("--db", default=EMPLOYEE_DB)
+    compact.set_defaults(run=vacuum_command)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    status = args.run(args)
+    print(f"{args.command} finished in {time.perf_counter() - started:.3f}s", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import numpy as np
+
+# -------------------------------
+# Employee Directory Search
+# -------------------------------
+# Filtering and prefix search over the employees frame on the server, so the
+# browser only ever receives one page of rows. Every searchable value (ID,
+# first name, last name, full name, email) is lowercased into one sorted key
+# array; a prefix is the contiguous run of keys between two binary searches,
+# which is what a prefix trie gives, in a flat numpy array. Department,
+# status and job title filters are vectorized equality masks.
+PREFIX_COLUMNS = ["employee_id", "first_name", "last_name", "email"]
+FILTER_COLUMNS = {"Department": "department", "Status": "employment_status", "Job Title": "job_title"}
+PAGE_SIZE = 50
+
+
+def _lower(series):
+    return series.astype("string").fillna("").str.strip().str.lower()
+
+
+class EmployeeDirectory:
+    """Search/filter index over an employees frame, returning matches a page at a time"""
+
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        fields = [_lower(self.df[col]) for col in PREFIX_COLUMNS if col in self.df.columns]
+        if {"first_name", "last_name"} <= set(self.df.columns):
+            fields.append((_lower(self.df["first_name"]) + " " + _lower(self.df["last_name"])).str.strip())
+        keys = np.concatenate([field.to_numpy(dtype=object) for field in fields]) if fields else np.array([], dtype=object)
+        rows = np.tile(np.arange(len(self.df)), len(fields))
+        order = np.argsort(keys, kind="stable")
+        self._keys, self._rows = keys[order], rows[order]
+        self._values = {
+            col: self.df[col].astype("string").fillna("").str.strip().to_numpy(dtype=object)
+            for col in FILTER_COLUMNS.values() if col in self.df.columns
+        }
+
+    def __len__(self):
+        return len(self.df)
+
+    def options(self, column):
+        """Distinct non-blank values of a filter column, sorted"""
+        return sorted(set(self._values.get(column, ())) - {""})
+
+    def prefix_rows(self, prefix):
+        """Row positions with any searchable value starting with `prefix` (case-insensitive)"""
+        prefix = prefix.strip().lower()
+        lo = np.searchsorted(self._keys, prefix, side="left")
+        hi = np.searchsorted(self._keys, prefix + "\U0010ffff", side="left")
+        return np.unique(self._rows[lo:hi])
+
+    def search(self, text="", filters=None):
+        """Row positions matching a prefix and column -> allowed values filters, in table order"""
+        mask = np.ones(len(self.df), dtype=bool)
+        for column, values in (filters or {}).items():
+            if values and column in self._values:
+                mask &= np.isin(self._values[column], list(values))
+        if text and text.strip():
+            hits = np.zeros(len(self.df), dtype=bool)
+            hits[self.prefix_rows(text)] = True
+            mask &= hits
+        return np.flatnonzero(mask)
+
+    def page(self, rows, page, size=PAGE_SIZE):
+        """Rows of one page (1-based) of a search result"""
+        start = (page - 1) * size
+        return self.df.iloc[rows[start:start + size]]
+
+
+def page_count(matches, size=PAGE_SIZE):
+    return max(1, -(-matches // size))
@@ -0,0 +1,65 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from tables import normalize_id as employee_key
+
+# -------------------------------
+# Employee Lookup Index
+# -------------------------------
+# Hash map from employee_id to a compact record with the display name
+# precomputed, so resolving a name is O(1) and reports annotate rows with a
+# dict lookup instead of merging the employees frame again.
+EmployeeRecord = namedtuple("EmployeeRecord", ["display_name", "department", "job_title"])
+
+
+def _text(value):
+    return None if value is None or pd.isna(value) else str(value)
+
+
+def make_record(first_name, last_name, department=None, job_title=None):
+    name = " ".join(part for part in (_text(first_name), _text(last_name)) if part)
+    return EmployeeRecord(name, _text(department), _text(job_title))
+
+
+class EmployeeIndex:
+    """employee_id -> EmployeeRecord"""
+
+    def __init__(self, records=None):
+        self._records = dict(records or {})
+
+    @classmethod
+    def from_frame(cls, df):
+        columns = [df[col] if col in df.columns else [None] * len(df) for col in ("first_name", "last_name", "department", "job_title")]
+        return cls(
+            (employee_key(employee_id), make_record(*fields))
+            for employee_id, *fields in zip(df["employee_id"], *columns)
+            if employee_key(employee_id) is not None
+        )
+
+    def __len__(self):
+        return len(self._records)
+
+    def copy(self):
+        return EmployeeIndex(self._records)
+
+    def get(self, employee_id):
+        return self._records.get(employee_key(employee_id))
+
+    def display_name(self, employee_id, default="Unknown"):
+        record = self.get(employee_id)
+        return record.display_name if record is not None else default
+
+    def upsert(self, employee_id, first_name, last_name, department=None, job_title=None):
+        self._records[employee_key(employee_id)] = make_record(first_name, last_name, department, job_title)
+
+    def annotate(self, df, id_column="employee_id"):
+        """Copy of df with `employee` (display name), `department` and `job_title` columns"""
+        # Resolve each distinct ID once, then broadcast to the rows by code
+        # (a trailing None row catches missing IDs, whose code is -1)
+        codes, uniques = pd.factorize(df[id_column])
+        resolved = [self._records.get(employee_key(value)) for value in uniques]
+        fields = np.array([tuple(r) if r else (None, None, None) for r in resolved] + [(None, None, None)], dtype=object)
+        rows = fields[codes]
+        return df.assign(employee=rows[:, 0], department=rows[:, 1], job_title=rows[:, 2])
@@ -0,0 +1,46 @@
+import gzip
+import io
+
+# -------------------------------
+# CSV Exports
+# -------------------------------
+# Exports are built only when the user asks for one, serialized one chunk of
+# rows at a time (optionally through gzip), and handed to st.download_button,
+# which serves them from Streamlit's media endpoint instead of inlining a
+# base64 data URI into the page.
+EXPORT_CHUNK_ROWS = 50000
+
+
+def frame_chunks(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yield row slices of an in-memory frame"""
+    if df.empty:
+        yield df
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def write_csv(chunks, fileobj):
+    """Write frame chunks as one CSV (header from the first chunk) to a binary file object"""
+    header = True
+    for chunk in chunks:
+        fileobj.write(chunk.to_csv(index=False, header=header).encode("utf-8"))
+        header = False
+
+
+def build_csv_export(chunks, compress=False):
+    """Serialize frame chunks to CSV bytes, gzip-compressed if requested"""
+    buffer = io.BytesIO()
+    if compress:
+        with gzip.GzipFile(fileobj=buffer, mode="wb") as gz:
+            write_csv(chunks, gz)
+    else:
+        write_csv(chunks, buffer)
+    return buffer.getvalue()
+
+
+def export_file_name(file_name, compress=False):
+    return file_name + ".gz" if compress else file_name
+
+
+def export_mime(compress=False):
+    return "application/gzip" if compress else "text/csv"
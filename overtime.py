@@ -0,0 +1,239 @@
+import os
+
+import pandas as pd
+
+from column_types import apply_types
+from exports import EXPORT_CHUNK_ROWS
+from sqlite_pool import create_indexes
+
+# -------------------------------
+# Overtime Entries Store
+# -------------------------------
+# Storage, import and report logic of the overtime app, with no Streamlit
+# dependency, so batch jobs and the CLI share it with the app. Every function
+# takes the ConnectionManager of the overtime database as `db`.
+DB_NAME = "overtime_app.db"  
+TABLE_NAME = "overtime_entries"  
+PAGE_SIZE = 20
+PICKER_LIMIT = 50
+IMPORT_CHUNK_SIZE = 10000
+REJECTED_SAMPLE_SIZE = 100
+ENTRY_COLUMNS = [
+    "date", "week_start", "week_end", "employee_id", "name", "department", "roster_group",
+    "overtime_type", "hours", "depot", "notes", "reviewed_by", "audit_status", "discrepancy_comments",
+]
+DATE_COLUMNS = ["date", "week_start", "week_end"]
+# In-memory column types (see column_types), applied once when entries are loaded
+ENTRY_TYPES = {
+    "date": "date", "week_start": "date", "week_end": "date", "employee_id": "id",
+    "department": "category", "roster_group": "category", "overtime_type": "category", "hours": "float",
+    "depot": "category", "reviewed_by": "category", "audit_status": "category",
+}
+
+# Secondary indexes created at bootstrap: (name, table, columns)
+INDEXES = [
+    ("ix_overtime_department", TABLE_NAME, ("department",)),
+    ("ix_overtime_department_date", TABLE_NAME, ("department", "date")),
+    ("ix_overtime_date", TABLE_NAME, ("date",)),
+    ("ix_overtime_audit_status", TABLE_NAME, ("audit_status",)),
+    ("ix_overtime_employee_id", TABLE_NAME, ("employee_id", "date")),
+]
+
+# Rollup of hours and entry counts per day x department x audit status x overtime type x depot,
+# updated in the same transaction as every write so reports never scan overtime_entries
+ROLLUP_TABLE = "overtime_rollup"
+ROLLUP_KEYS = ["date", "department", "audit_status", "overtime_type", "depot"]
+ROLLUP_UPSERT = f"""
+    INSERT INTO {ROLLUP_TABLE} (day, department, audit_status, overtime_type, depot, hours, entries)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (day, department, audit_status, overtime_type, depot)
+    DO UPDATE SET hours = hours + excluded.hours, entries = entries + excluded.entries
+"""
+
+
+def init_rollup(conn):
+    """Create the rollup table, and build it from overtime_entries if it is new"""
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (
+            day TEXT NOT NULL,
+            department TEXT NOT NULL,
+            audit_status TEXT NOT NULL,
+            overtime_type TEXT NOT NULL,
+            depot TEXT NOT NULL,
+            hours REAL NOT NULL,
+            entries INTEGER NOT NULL,
+            PRIMARY KEY (day, department, audit_status, overtime_type, depot)
+        ) WITHOUT ROWID
+    """)
+    if conn.execute(f"SELECT EXISTS (SELECT 1 FROM {ROLLUP_TABLE})").fetchone()[0]:
+        return
+    conn.execute(f"""
+        INSERT INTO {ROLLUP_TABLE} (day, department, audit_status, overtime_type, depot, hours, entries)
+        SELECT COALESCE(date, ''), COALESCE(department, ''), COALESCE(audit_status, ''),
+               COALESCE(overtime_type, ''), COALESCE(depot, ''), COALESCE(SUM(hours), 0), COUNT(*)
+        FROM {TABLE_NAME} GROUP BY 1, 2, 3, 4, 5
+    """)
+
+def update_rollup(conn, entries, sign=1):
+    """Add (sign=1) or remove (sign=-1) entries' hours and counts in the rollup, in the caller's transaction"""
+    if entries.empty:
+        return
+    keys = entries[ROLLUP_KEYS].astype(object).where(entries[ROLLUP_KEYS].notna(), "")
+    hours = pd.to_numeric(entries["hours"], errors='coerce').fillna(0)
+    deltas = keys.assign(hours=hours).groupby(ROLLUP_KEYS).agg(hours=("hours", "sum"), entries=("hours", "size"))
+    conn.executemany(ROLLUP_UPSERT, [
+        (*key, sign * float(row.hours), sign * int(row.entries)) for key, row in zip(deltas.index, deltas.itertuples())
+    ])
+    if sign < 0:
+        conn.execute(f"DELETE FROM {ROLLUP_TABLE} WHERE entries <= 0")
+
+def init_db(db):  
+    with db.transaction() as conn:
+        c = conn.cursor()  
+        c.execute(f"""  
+            CREATE TABLE IF NOT EXISTS {TABLE_NAME} (  
+                entry_id INTEGER PRIMARY KEY AUTOINCREMENT,  
+                date TEXT,  
+                week_start TEXT,  
+                week_end TEXT,  
+                employee_id TEXT,  
+                name TEXT,  
+                department TEXT,  
+                roster_group TEXT,  
+                overtime_type TEXT,  
+                hours REAL,  
+                depot TEXT,  
+                notes TEXT,  
+                reviewed_by TEXT,  
+                audit_status TEXT,  
+                discrepancy_comments TEXT  
+            )  
+        """)  
+        create_indexes(conn, INDEXES)
+        init_rollup(conn)
+  
+def insert_entry(db, entry):  
+    with db.transaction() as conn:
+        c = conn.cursor()  
+        c.execute(f"""  
+            INSERT INTO {TABLE_NAME} (  
+                date, week_start, week_end, employee_id, name, department, roster_group,  
+                overtime_type, hours, depot, notes, reviewed_by, audit_status, discrepancy_comments  
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)  
+        """, (  
+            entry['date'], entry['week_start'], entry['week_end'], entry['employee_id'], entry['name'],  
+            entry['department'], entry['roster_group'], entry['overtime_type'], entry['hours'],  
+            entry['depot'], entry['notes'], entry['reviewed_by'], entry['audit_status'], entry['discrepancy_comments']  
+        ))  
+        update_rollup(conn, pd.DataFrame([entry]))
+  
+def fetch_page(db, department=None, before_id=None, limit=PAGE_SIZE):
+    """Keyset page of entries (typed, see ENTRY_TYPES), newest first, strictly older than `before_id`"""
+    query = f"SELECT * FROM {TABLE_NAME}"
+    clauses, params = [], []
+    if department:
+        clauses.append("department = ?")
+        params.append(department)
+    if before_id is not None:
+        clauses.append("entry_id < ?")
+        params.append(int(before_id))
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY entry_id DESC LIMIT ?"
+    params.append(limit)
+    with db.connection() as conn:
+        return apply_types(pd.read_sql_query(query, conn, params=params), ENTRY_TYPES)
+
+def search_entries(db, department, term="", limit=PICKER_LIMIT):
+    """Bounded lookup for the delete picker: exact entry ID or employee ID / name prefix"""
+    query = f"SELECT entry_id, date, employee_id, name FROM {TABLE_NAME} WHERE department = ?"
+    params = [department]
+    term = term.strip()
+    if term:
+        query += " AND (entry_id = ? OR employee_id LIKE ? OR name LIKE ?)"
+        # Only plain ASCII digits that fit in SQLite's 64-bit INTEGER can be an entry ID
+        entry_id = int(term) if term.isascii() and term.isdigit() and len(term) <= 18 else None
+        params += [entry_id, term + "%", term + "%"]
+    query += " ORDER BY entry_id DESC LIMIT ?"
+    params.append(limit)
+    with db.connection() as conn:
+        return conn.execute(query, params).fetchall()
+  
+def validate_chunk(chunk, first_line):
+    """Coerce a CSV chunk to the overtime_entries schema; returns (valid rows, rejected rows with reasons)"""
+    chunk = chunk.reindex(columns=ENTRY_COLUMNS)
+    chunk.index = range(first_line, first_line + len(chunk))
+    reasons = pd.Series("", index=chunk.index)
+    coerced = {}
+    for col in DATE_COLUMNS:
+        # Each value parsed on its own: inferring one format from the first row would reject the rest
+        parsed = pd.to_datetime(chunk[col], errors='coerce', format='mixed')
+        reasons[chunk[col].notna() & parsed.isna()] += f"invalid {col}; "
+        coerced[col] = parsed.dt.strftime('%Y-%m-%d')
+    reasons[chunk['date'].isna()] += "missing date; "
+    hours = pd.to_numeric(chunk['hours'], errors='coerce')
+    reasons[hours.isna() | (hours < 0)] += "invalid hours; "
+    coerced['hours'] = hours
+    bad = reasons != ""
+    # Rejected rows keep the values as written, so the report shows what was wrong
+    rejected = chunk[bad].assign(line=chunk.index[bad], reason=reasons[bad].str.rstrip("; "))
+    return chunk[~bad].assign(**{col: values[~bad] for col, values in coerced.items()}), rejected
+
+def import_data(db, uploaded_file, progress=None):  
+    """Stream a CSV (path or binary file object) into overtime_entries in chunks,
+    all-or-nothing in one transaction.
+
+    Returns (rows inserted, rows rejected, sample of rejected rows)."""
+    if isinstance(uploaded_file, (str, os.PathLike)):
+        with open(uploaded_file, "rb") as f:
+            return import_data(db, f, progress)
+    total_bytes = getattr(uploaded_file, "size", None)
+    insert_sql = f"INSERT INTO {TABLE_NAME} ({', '.join(ENTRY_COLUMNS)}) VALUES ({', '.join('?' for _ in ENTRY_COLUMNS)})"
+    inserted, rejected_count, rejected_samples = 0, 0, []
+    first_line = 2  # line 1 is the header
+    uploaded_file.seek(0)
+    with db.transaction() as conn:
+        for chunk in pd.read_csv(uploaded_file, chunksize=IMPORT_CHUNK_SIZE, dtype=str):
+            valid, rejected = validate_chunk(chunk, first_line)
+            first_line += len(chunk)
+            rows = valid.astype(object).where(valid.notna(), None).itertuples(index=False, name=None)
+            conn.executemany(insert_sql, rows)
+            update_rollup(conn, valid)
+            inserted += len(valid)
+            rejected_count += len(rejected)
+            if len(rejected_samples) < REJECTED_SAMPLE_SIZE:
+                rejected_samples.extend(rejected.head(REJECTED_SAMPLE_SIZE - len(rejected_samples)).to_dict("records"))
+            if progress is not None and total_bytes:
+                progress(min(uploaded_file.tell() / total_bytes, 1.0))
+    return inserted, rejected_count, pd.DataFrame(rejected_samples)
+  
+def delete_entry(db, entry_id):  
+    with db.transaction() as conn:
+        removed = pd.read_sql_query(f"SELECT {', '.join(ROLLUP_KEYS)}, hours FROM {TABLE_NAME} WHERE entry_id = ?", conn, params=(entry_id,))
+        conn.execute(f"DELETE FROM {TABLE_NAME} WHERE entry_id = ?", (entry_id,))
+        update_rollup(conn, removed, sign=-1)
+
+def export_chunks(db, chunk_rows=EXPORT_CHUNK_ROWS):
+    """All entries in entry order, as frames of at most `chunk_rows` rows"""
+    # A generator, so the connection is held until the last chunk is read
+    with db.connection() as conn:
+        yield from pd.read_sql_query(f"SELECT * FROM {TABLE_NAME} ORDER BY entry_id", conn, chunksize=chunk_rows)
+
+def report_date_span(db):
+    """(first day, last day) with entries, or (None, None)"""
+    with db.connection() as conn:
+        return conn.execute(f"SELECT MIN(day), MAX(day) FROM {ROLLUP_TABLE} WHERE day <> ''").fetchone()
+
+def report_aggregates(db, date_from, date_to):
+    """Report aggregations over a date range, read from the rollup table only"""
+    where = f"FROM {ROLLUP_TABLE} WHERE day >= ? AND day <= ?"
+    params = [str(date_from), str(date_to)]
+    with db.connection() as conn:
+        def query(sql):
+            return apply_types(pd.read_sql_query(sql, conn, params=params), ENTRY_TYPES)
+        by_department = query(f"SELECT department, SUM(hours) AS hours {where} AND department <> '' GROUP BY department")
+        trend = query(f"SELECT day AS date, SUM(hours) AS hours {where} GROUP BY day ORDER BY day")
+        audit = query(f"SELECT audit_status, SUM(entries) AS count {where} AND audit_status <> '' GROUP BY audit_status ORDER BY count DESC")
+        pivot = query(f"SELECT department, audit_status, SUM(hours) AS hours {where} AND department <> '' AND audit_status <> '' GROUP BY department, audit_status")
+    pivot = pd.pivot_table(pivot, values="hours", index="department", columns="audit_status", aggfunc="sum", fill_value=0, observed=True)
+    return by_department, trend, audit, pivot
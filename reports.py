@@ -0,0 +1,252 @@
+import datetime
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from employee_index import EmployeeIndex
+from storage import TABLE_SCHEMAS, primary_key, quote
+
+# -------------------------------
+# Report Registry
+# -------------------------------
+# Each report is a spec run by the one executor below:
+#   tables    source tables (their rows are stacked; dates come from each schema's date_column)
+#   group_by  True to group by the "Group By" selection (Employee / Department / Job Title)
+#   groups    fixed group keys, after the selection ("month" is derived from the date)
+#   value     column to aggregate with `agg` ("count" needs none, "mean" averages it)
+#   ylabel    chart axis label
+#   ordered   True if the rows are a time series (charted in order rather than as top-N)
+GROUP_BY_COLUMNS = {"Employee": "employee", "Department": "department", "Job Title": "job_title"}
+EMPLOYEE_COLUMNS = set(GROUP_BY_COLUMNS.values())
+ACTIVITY_TABLES = ["meetings", "disciplinary", "performance", "training"]
+
+REPORTS = {
+    "Employee Activity": {"tables": ACTIVITY_TABLES, "group_by": True, "agg": "count", "ylabel": "Activity Count"},
+    "Department Performance": {"tables": ["performance"], "groups": ["department"], "value": "score", "agg": "mean", "ylabel": "Average Score"},
+    "Training Completion": {"tables": ["training"], "groups": ["status"], "agg": "count", "ylabel": "Count"},
+    "Meeting Frequency": {"tables": ["meetings"], "groups": ["month"], "agg": "count", "ylabel": "Number of Meetings", "ordered": True},
+    "Employees by Employment Status": {"tables": ["employees"], "groups": ["employment_status"], "agg": "count", "ylabel": "Number of Employees"},
+    "Disciplinary Actions by Violations": {"tables": ["disciplinary"], "groups": ["violation"], "agg": "count", "ylabel": "Number of Incidents"},
+    "Disciplinary Actions per Employee": {"tables": ["disciplinary"], "group_by": True, "agg": "count", "ylabel": "Number of Disciplinary Actions"},
+    "Training per Employee": {"tables": ["training"], "group_by": True, "agg": "count", "ylabel": "Number of Trainings"},
+    "Training Completion Status": {"tables": ["training"], "group_by": True, "groups": ["status"], "agg": "count", "ylabel": "Count"},
+    "Performance per Employee": {"tables": ["performance"], "group_by": True, "value": "score", "agg": "mean", "ylabel": "Average Score"},
+}
+UNKNOWN = "Unknown"
+
+
+def group_keys(report, group_by=()):
+    """Group key columns of a report for a "Group By" selection (Employee if none is selected)"""
+    spec = REPORTS[report]
+    selected = ([GROUP_BY_COLUMNS[option] for option in group_by] or ["employee"]) if spec.get("group_by") else []
+    return selected + spec.get("groups", [])
+
+
+def date_column(table_name):
+    return TABLE_SCHEMAS[table_name]["date_column"]
+
+
+def report_requirements(report):
+    """Table name -> columns a report reads from it"""
+    spec = REPORTS[report]
+    requirements = {}
+    for table_name in spec["tables"]:
+        columns = TABLE_SCHEMAS[table_name]["columns"]
+        wanted = [primary_key(table_name), "employee_id", date_column(table_name), spec.get("value")] + spec.get("groups", [])
+        requirements[table_name] = list(dict.fromkeys(col for col in wanted if col in columns))
+    return requirements
+
+
+def report_label(column):
+    return column.replace("_", " ").title()
+
+
+# -------------------------------
+# Executor
+# -------------------------------
+def source_rows(report, frames, annotate, keys):
+    """Stacked source rows with `day` (if dated), the group keys and the value column"""
+    spec = REPORTS[report]
+    parts = []
+    for table_name in spec["tables"]:
+        df = frames(table_name)
+        dated = date_column(table_name)
+        columns = {"employee_id": df["employee_id"]}
+        if dated:
+            columns["day"] = pd.to_datetime(df[dated], errors="coerce").dt.normalize()
+        for col in [spec.get("value")] + spec.get("groups", []):
+            if col in df.columns:
+                columns[col] = df[col]
+        parts.append(pd.DataFrame(columns))
+    rows = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+    if EMPLOYEE_COLUMNS & set(keys):
+        rows = annotate(rows)
+    if spec.get("value"):
+        rows[spec["value"]] = pd.to_numeric(rows[spec["value"]], errors="coerce")
+    return rows
+
+
+def build_cube(report, rows, keys):
+    """Per-day (if dated) counts and value sums for every group.
+
+    Months are derived from the (much smaller) cube when it is summarized."""
+    spec = REPORTS[report]
+    value = spec.get("value")
+    by = [key for key in keys if key != "month"] + (["day"] if "day" in rows.columns else [])
+    if value:
+        rows = rows[rows[value].notna()]
+    grouped = rows.groupby(by, observed=True, sort=False, dropna=False)
+    cube = grouped.size().rename("rows").to_frame()
+    if value:
+        cube["total"] = grouped[value].sum()
+    cube = cube.reset_index()
+    return cube.assign(**{key: cube[key].astype(object).where(cube[key].notna(), UNKNOWN) for key in by if key != "day"})
+
+
+def summarize(report, cube, keys, date_from=None, date_to=None):
+    """Aggregate a cube over a date range into the report table"""
+    spec = REPORTS[report]
+    if "day" in cube.columns and date_from is not None:
+        cube = cube[(cube["day"] >= pd.Timestamp(date_from)) & (cube["day"] <= pd.Timestamp(date_to))]
+    if cube.empty:
+        return None
+    if "month" in keys:
+        cube = cube[cube["day"].notna()].assign(month=cube["day"].dt.strftime("%Y-%m"))
+    totals = cube.groupby(keys, observed=True, sort=False)[["rows", "total"] if spec.get("value") else ["rows"]].sum()
+    if spec["agg"] == "mean":
+        result = (totals["total"] / totals["rows"]).rename(report_label(spec["value"]))
+    else:
+        result = totals["rows"].rename("Count")
+    result = result.sort_index() if "month" in keys else result.sort_values(ascending=False, kind="stable")
+    return result.reset_index().rename(columns={key: report_label(key) for key in keys})
+
+
+# -------------------------------
+# SQL Pushdown
+# -------------------------------
+# The same specs compiled to one parameterized SQLite query: date-range
+# predicates on each source table (served by its date index), a LEFT JOIN to
+# employees for employee groups and the GROUP BY aggregation, so only the
+# result rows leave the database. Dates are stored as ISO text.
+EMPLOYEE_SQL = {
+    "employee": "CASE WHEN e.employee_id IS NULL THEN NULL "
+    "ELSE TRIM(COALESCE(e.first_name, '') || ' ' || COALESCE(e.last_name, '')) END",
+    "department": "e.department",
+    "job_title": "e.job_title",
+}
+
+
+def _source_sql(report, table_name, date_from, date_to):
+    spec = REPORTS[report]
+    columns = TABLE_SCHEMAS[table_name]["columns"]
+    dated = date_column(table_name)
+    select = ["employee_id"] + ([f"{quote(dated)} AS day"] if dated else [])
+    select += [quote(col) for col in [spec.get("value")] + spec.get("groups", []) if col in columns]
+    where, params = [], []
+    if dated and date_from is not None:
+        # Half-open range so timestamps on the last day are included
+        where.append(f"{quote(dated)} >= ? AND {quote(dated)} < ?")
+        params += [pd.Timestamp(date_from).strftime("%Y-%m-%d"), (pd.Timestamp(date_to) + datetime.timedelta(days=1)).strftime("%Y-%m-%d")]
+    if spec.get("value"):
+        where.append(f"{quote(spec['value'])} IS NOT NULL AND TRIM({quote(spec['value'])}) <> ''")
+    sql = f"SELECT {', '.join(select)} FROM {quote(table_name)}"
+    return (sql + " WHERE " + " AND ".join(where) if where else sql), params
+
+
+def compile_report_sql(report, keys, date_from=None, date_to=None):
+    """(sql, params) computing a report table in SQLite: the group columns, then the aggregate"""
+    spec = REPORTS[report]
+    sources = [_source_sql(report, table_name, date_from, date_to) for table_name in spec["tables"]]
+    source = " UNION ALL ".join(sql for sql, _ in sources)
+    params = [param for _, source_params in sources for param in source_params]
+    expressions = {key: EMPLOYEE_SQL.get(key, "substr(s.day, 1, 7)" if key == "month" else f"s.{quote(key)}") for key in keys}
+    if spec["agg"] == "mean":
+        value_label, value_sql = report_label(spec["value"]), f"AVG(CAST(s.{quote(spec['value'])} AS REAL))"
+    else:
+        value_label, value_sql = "Count", "COUNT(*)"
+    select = [f"COALESCE({expression}, '{UNKNOWN}') AS {quote(report_label(key))}" for key, expression in expressions.items()]
+    sql = f"SELECT {', '.join(select + [f'{value_sql} AS {quote(value_label)}'])} FROM ({source}) AS s"
+    if EMPLOYEE_COLUMNS & set(keys):
+        sql += " LEFT JOIN employees AS e ON e.employee_id = s.employee_id"
+    group_columns = ", ".join(str(position) for position in range(1, len(keys) + 1))
+    sql += f" GROUP BY {group_columns}"
+    sql += f" ORDER BY {group_columns}" if "month" in keys else f" ORDER BY {len(keys) + 1} DESC"
+    return sql, params
+
+
+# -------------------------------
+# Memoized Reports
+# -------------------------------
+class ReportEngine:
+    """Runs report specs, memoizing the day cube per (report, groups, data versions)
+    and each result per date range on top, so repeated and nearby requests are cheap"""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cubes = OrderedDict()
+        self._results = OrderedDict()
+
+    def _remember(self, memo, key, value):
+        with self._lock:
+            memo[key] = value
+            memo.move_to_end(key)
+            while len(memo) > self.max_entries:
+                memo.popitem(last=False)
+
+    def _recall(self, memo, key):
+        with self._lock:
+            if key in memo:
+                memo.move_to_end(key)
+                return True, memo[key]
+            return False, None
+
+    def run(self, report, frames, annotate, group_by=(), date_from=None, date_to=None, versions=None, query=None):
+        """Report table (None if there are no rows) for the selected groups and date range.
+
+        `frames(table)` returns a source table and `annotate(df)` adds employee columns.
+        With `query(sql, params)` the aggregation is pushed down to SQLite instead.
+        `versions` identifies the data (e.g. saved table versions); None disables memoizing."""
+        keys = group_keys(report, group_by)
+        cube_key = (report, tuple(keys), versions)
+        result_key = cube_key + (date_from, date_to)
+        if versions is not None:
+            found, result = self._recall(self._results, result_key)
+            if found:
+                return result
+        if query is not None:
+            result = query(*compile_report_sql(report, keys, date_from, date_to))
+            result = None if result.empty else result
+            if versions is not None:
+                self._remember(self._results, result_key, result)
+            return result
+        if versions is not None:
+            found, cube = self._recall(self._cubes, cube_key)
+        else:
+            found = False
+        if not found:
+            cube = build_cube(report, source_rows(report, frames, annotate, keys), keys)
+            if versions is not None:
+                self._remember(self._cubes, cube_key, cube)
+        result = summarize(report, cube, keys, date_from, date_to)
+        if versions is not None:
+            self._remember(self._results, result_key, result)
+        return result
+
+
+def run_report(storage, report, group_by=(), date_from=None, date_to=None, engine=None):
+    """Report table (None if there are no rows) from a StorageEngine's saved data, without a UI.
+
+    Pushed down to SQLite when the backend supports it, otherwise run in memory."""
+    engine = engine or ReportEngine()
+    requirements = report_requirements(report)
+    versions = tuple(storage.version(table_name) for table_name in ["employees"] + list(requirements))
+    if storage.supports_sql:
+        return engine.run(report, None, None, group_by, date_from, date_to, versions, storage.query)
+
+    def frames(table_name):
+        return storage.load(table_name, requirements[table_name])
+
+    index = EmployeeIndex.from_frame(storage.load("employees"))
+    return engine.run(report, frames, index.annotate, group_by, date_from, date_to, versions)
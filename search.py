@@ -0,0 +1,81 @@
+import datetime
+import re
+
+import pandas as pd
+
+from reports import EMPLOYEE_SQL, date_column
+from sqlite_pool import fts_table
+from storage import TABLES, primary_key, quote, search_columns
+
+# -------------------------------
+# Full-Text Search
+# -------------------------------
+# Free-text columns (meeting notes, disciplinary narratives) are indexed with
+# SQLite FTS5 (see create_fts_index). A search is one query per indexed
+# table: MATCH on the index, BM25 ranking, a highlighted snippet and the
+# employee/date filters on the table itself, so only the top hits are read.
+SEARCH_TABLES = [table_name for table_name in TABLES if search_columns(table_name)]
+SEARCH_LIMIT = 50
+SNIPPET_TOKENS = 16
+# Highlight markers placed by snippet(); control characters never occur in the text
+MARK_START, MARK_END = "\x02", "\x03"
+
+
+def fts_query(text):
+    """FTS5 query matching every word of free text (the last word as a prefix).
+
+    Words are quoted, so FTS5 operators and punctuation in the text are matched
+    literally rather than parsed. Returns None if there is nothing to search for."""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+
+def _table_search_sql(table_name, employee_id, date_from, date_to, limit):
+    fts = quote(fts_table(table_name))
+    dated = date_column(table_name)
+    sql = (
+        f"SELECT '{table_name}' AS source, t.{quote(primary_key(table_name))} AS record_id, t.employee_id, "
+        f"COALESCE({EMPLOYEE_SQL['employee']}, '') AS employee, t.{quote(dated)} AS date, "
+        f"snippet({fts}, -1, '{MARK_START}', '{MARK_END}', '…', {SNIPPET_TOKENS}) AS snippet, bm25({fts}) AS score "
+        f"FROM {fts} JOIN {quote(table_name)} AS t ON t.rowid = {fts}.rowid "
+        f"LEFT JOIN employees AS e ON e.employee_id = t.employee_id "
+        f"WHERE {fts} MATCH ?"
+    )
+    params = []
+    if employee_id:
+        sql += " AND t.employee_id = ?"
+        params.append(employee_id)
+    if date_from is not None:
+        sql += f" AND t.{quote(dated)} >= ?"
+        params.append(pd.Timestamp(date_from).strftime("%Y-%m-%d"))
+    if date_to is not None:
+        # Half-open so timestamps on the last day are included
+        sql += f" AND t.{quote(dated)} < ?"
+        params.append((pd.Timestamp(date_to) + datetime.timedelta(days=1)).strftime("%Y-%m-%d"))
+    return f"SELECT * FROM ({sql} ORDER BY score LIMIT {int(limit)})", params
+
+
+def compile_search_sql(query, tables=SEARCH_TABLES, employee_id=None, date_from=None, date_to=None, limit=SEARCH_LIMIT):
+    """(sql, params) for the best `limit` hits of an FTS5 query across tables, best first (lowest BM25)"""
+    parts = [_table_search_sql(table_name, employee_id, date_from, date_to, limit) for table_name in tables]
+    sql = " UNION ALL ".join(part for part, _ in parts) + f" ORDER BY score LIMIT {int(limit)}"
+    params = [param for part_sql, part_params in parts for param in [query] + part_params]
+    return sql, params
+
+
+def search(run_query, text, tables=SEARCH_TABLES, employee_id=None, date_from=None, date_to=None, limit=SEARCH_LIMIT):
+    """Ranked hits for free text as a frame (source, record_id, employee_id, employee, date, snippet, score).
+
+    `run_query(sql, params)` runs SQL against the database (e.g. StorageEngine.query)."""
+    query = fts_query(text)
+    if query is None or not tables:
+        return None
+    return run_query(*compile_search_sql(query, tables, employee_id, date_from, date_to, limit))
+
+
+def highlight_markdown(snippet):
+    """Snippet as Markdown: the text escaped, the matched words in bold"""
+    text = re.sub(r"([\\`*_{}\[\]()#+\-.!|<>~$])", r"\\\1", snippet or "")
+    return text.replace(MARK_START, "**").replace(MARK_END, "**")
@@ -0,0 +1,104 @@
+import os
+
+import pandas as pd
+
+from column_types import apply_types
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow ships with streamlit, but keep CSV working without it
+    pa = None
+
+# -------------------------------
+# Columnar Table Snapshots
+# -------------------------------
+# Tables under DATA_DIR are stored as Parquet (default) or Arrow IPC files
+# written with an explicit schema and zstd compression, so loading is a typed
+# read that can skip columns. The schema follows the table's column kinds
+# (see column_types): IDs and counts as int64, measures as float64, dates as
+# timestamps, labels dictionary-encoded; anything else (or a column left as
+# text because its values would not cast) as string. Legacy CSV files are
+# migrated on first load.
+SNAPSHOT_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+SNAPSHOT_COMPRESSION = "zstd"
+
+
+def resolve_format(fmt):
+    """Fall back to CSV when pyarrow is not installed"""
+    if fmt not in SNAPSHOT_EXTENSIONS:
+        raise ValueError(f"Unknown snapshot format: {fmt}")
+    return fmt if pa is not None else "csv"
+
+
+def snapshot_path(data_dir, table_name, fmt):
+    return os.path.join(data_dir, table_name + SNAPSHOT_EXTENSIONS[fmt])
+
+
+def arrow_type(series, kind=None):
+    """Arrow type of a typed column of the given kind; string if it is not typed as its kind"""
+    dtype = series.dtype
+    if kind in ("id", "int") and pd.api.types.is_integer_dtype(dtype):
+        return pa.int64()
+    if kind in ("int", "float") and pd.api.types.is_float_dtype(dtype):
+        return pa.float64()
+    if kind == "date" and pd.api.types.is_datetime64_any_dtype(dtype):
+        return pa.timestamp("us")
+    if kind == "category" and isinstance(dtype, pd.CategoricalDtype) and pd.api.types.is_string_dtype(dtype.categories.dtype):
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()
+
+
+def table_schema(df, types=None):
+    """Explicit Arrow schema for a frame from its column kinds (column -> kind)"""
+    types = types or {}
+    return pa.schema([(str(col), arrow_type(df[col], types.get(col))) for col in df.columns])
+
+
+def to_pandas(table):
+    # Nullable integers stay integers instead of turning into floats around missing values
+    return table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+
+
+def write_snapshot(data_dir, table_name, df, fmt="parquet", types=None):
+    """Write a table snapshot in the given format, typed by its column kinds"""
+    fmt = resolve_format(fmt)
+    path = snapshot_path(data_dir, table_name, fmt)
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+        return path
+    schema = table_schema(df, types)
+    text = {field.name: "string" for field in schema if field.type == pa.string()}
+    table = pa.Table.from_pandas(df.astype(text), schema=schema, preserve_index=False)
+    tmp_path = path + ".tmp"
+    if fmt == "parquet":
+        pq.write_table(table, tmp_path, compression=SNAPSHOT_COMPRESSION)
+    else:
+        feather.write_feather(table, tmp_path, compression=SNAPSHOT_COMPRESSION)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_snapshot(data_dir, table_name, fmt="parquet", columns=None, types=None):
+    """Read a table snapshot (optionally only some columns); None if there is none.
+
+    A legacy CSV is converted to the requested format (typed by `types`) on first read."""
+    fmt = resolve_format(fmt)
+    path = snapshot_path(data_dir, table_name, fmt)
+    csv_path = snapshot_path(data_dir, table_name, "csv")
+    if fmt != "csv" and not os.path.exists(path) and os.path.exists(csv_path):
+        write_snapshot(data_dir, table_name, apply_types(pd.read_csv(csv_path, dtype=str), types or {}), fmt, types)
+        os.replace(csv_path, csv_path + ".migrated")
+    if not os.path.exists(path):
+        return None
+    if fmt == "csv":
+        # As text: the caller types it, and inferring would turn an ID like "007" into 7
+        return pd.read_csv(path, dtype=str, usecols=lambda col: columns is None or col in columns)
+    if fmt == "parquet":
+        available = pq.read_schema(path).names
+        wanted = None if columns is None else [col for col in columns if col in available]
+        return to_pandas(pq.read_table(path, columns=wanted))
+    available = pa.ipc.open_file(pa.memory_map(path)).schema.names
+    wanted = None if columns is None else [col for col in columns if col in available]
+    return to_pandas(feather.read_table(path, columns=wanted, memory_map=True))
@@ -0,0 +1,169 @@
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# -------------------------------
+# Pooled SQLite Connections
+# -------------------------------
+# One ConnectionManager per database file is shared by the whole process
+# (the apps cache it with st.cache_resource). It keeps a bounded pool of
+# connections, each opened once and tuned with the pragmas below, and lends
+# them out for the span of a `with db.connection()` block, so every thread
+# (each Streamlit rerun runs on a new one) reuses the same few connections.
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -20000,  # ~20 MB page cache
+    "mmap_size": 268435456,  # 256 MB
+    "temp_store": "MEMORY",
+}
+# Most connections open at once; a checkout waits (up to busy_timeout) for one to be returned
+POOL_SIZE = 8
+
+
+def is_locked_error(error):
+    """True if a sqlite3 error is a transient lock/busy condition worth retrying"""
+    message = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and ("locked" in message or "busy" in message)
+
+
+class ConnectionManager:
+    """Process-wide pool of SQLite connections with WAL and a busy/retry policy"""
+
+    def __init__(self, path, busy_timeout=5.0, retries=5, retry_delay=0.05, pool_size=POOL_SIZE):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.pool_size = pool_size
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+        for name, value in PRAGMAS.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            opening = self._opened < self.pool_size
+            if opening:
+                self._opened += 1
+        if not opening:
+            try:
+                return self._idle.get(timeout=self.busy_timeout)
+            except queue.Empty:
+                raise sqlite3.OperationalError(f"no free connection to {self.path} (pool of {self.pool_size})") from None
+        try:
+            return self._open()
+        except BaseException:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection (autocommit mode) for the block; it goes back to the pool after"""
+        conn = self._checkout()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._idle.put(conn)
+
+    def retry(self, fn, *args, **kwargs):
+        """Call fn, retrying with exponential backoff while the database is locked"""
+        for attempt in range(self.retries + 1):
+            try:
+                return fn(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if attempt == self.retries or not is_locked_error(e):
+                    raise
+                time.sleep(self.retry_delay * (2 ** attempt))
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction on a pooled connection: BEGIN IMMEDIATE (retried while locked), COMMIT or ROLLBACK"""
+        with self.connection() as conn:
+            self.retry(conn.execute, "BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                self.retry(conn.execute, "COMMIT")
+
+
+def create_indexes(conn, indexes):
+    """Create declared (name, table, columns) indexes, skipping any whose columns are missing"""
+    for name, table, columns in indexes:
+        existing = {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+        if not set(columns) <= existing:
+            continue
+        column_list = ", ".join(f'"{col}"' for col in columns)
+        conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({column_list})')
+
+
+def fts_table(table):
+    """Name of a table's FTS5 index"""
+    return f"{table}_fts"
+
+
+def create_fts_index(conn, table, columns):
+    """Create an FTS5 index over `columns` of a table, kept in sync by triggers.
+
+    The index is external-content (text is read back from the table by rowid, not
+    stored twice) and is built from the existing rows when it is first created.
+    The indexed tables key rows by text, so their rowids are implicit and VACUUM
+    may renumber them: vacuum the database with vacuum(), which rebuilds the
+    indexes afterwards, never with a bare VACUUM."""
+    fts = fts_table(table)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (fts,)).fetchone():
+        return
+    column_list = ", ".join(f'"{col}"' for col in columns)
+    new_values = ", ".join(f'new."{col}"' for col in columns)
+    old_values = ", ".join(f'old."{col}"' for col in columns)
+    conn.execute(
+        f'CREATE VIRTUAL TABLE "{fts}" USING fts5({column_list}, '
+        f"content='{table}', content_rowid='rowid', tokenize='porter unicode61')"
+    )
+    conn.execute(
+        f'CREATE TRIGGER "{fts}_ai" AFTER INSERT ON "{table}" BEGIN '
+        f'INSERT INTO "{fts}" (rowid, {column_list}) VALUES (new.rowid, {new_values}); END'
+    )
+    conn.execute(
+        f'CREATE TRIGGER "{fts}_ad" AFTER DELETE ON "{table}" BEGIN '
+        f"INSERT INTO \"{fts}\" (\"{fts}\", rowid, {column_list}) VALUES ('delete', old.rowid, {old_values}); END"
+    )
+    conn.execute(
+        f'CREATE TRIGGER "{fts}_au" AFTER UPDATE OF {column_list} ON "{table}" BEGIN '
+        f"INSERT INTO \"{fts}\" (\"{fts}\", rowid, {column_list}) VALUES ('delete', old.rowid, {old_values}); "
+        f'INSERT INTO "{fts}" (rowid, {column_list}) VALUES (new.rowid, {new_values}); END'
+    )
+    conn.execute(f"INSERT INTO \"{fts}\" (\"{fts}\") VALUES ('rebuild')")
+
+
+def rebuild_fts_indexes(conn):
+    """Rebuild every FTS5 index in the database from its table's current rowids"""
+    indexes = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND sql LIKE 'CREATE VIRTUAL TABLE % USING fts5(%'").fetchall()
+    for (fts,) in indexes:
+        conn.execute(f"INSERT INTO \"{fts}\" (\"{fts}\") VALUES ('rebuild')")
+
+
+def vacuum(db):
+    """VACUUM a database, then rebuild its FTS5 indexes, whose rowids VACUUM may have renumbered"""
+    with db.connection() as conn:
+        db.retry(conn.execute, "VACUUM")
+    with db.transaction() as conn:
+        rebuild_fts_indexes(conn)
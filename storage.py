@@ -0,0 +1,552 @@
+import atexit
+import os
+import sqlite3
+import sys
+from concurrent.futures import Future
+
+import pandas as pd
+
+from column_types import apply_types, concat_typed, sql_type, storage_rows
+from snapshots import read_snapshot, resolve_format, snapshot_path, write_snapshot
+from sqlite_pool import ConnectionManager, create_fts_index, create_indexes
+from table_cache import TableCache
+from tables import KeyedTable, normalize_id
+from write_queue import ChangeSet, WriteQueue, WriteResult
+
+# -------------------------------
+# Canonical Table Schemas
+# -------------------------------
+# One schema per table, used by every backend, form, upload and report.
+# `types` gives each non-text column its in-memory kind (see column_types).
+# `search_columns` are the free-text columns indexed for full-text search.
+TABLE_SCHEMAS = {
+    "employees": {
+        "primary_key": "employee_id",
+        "date_column": None,
+        "columns": ["employee_id", "first_name", "last_name", "department", "job_title", "email", "phone", "employment_status"],
+        "types": {"employee_id": "id", "department": "category", "job_title": "category", "employment_status": "category"},
+    },
+    "meetings": {
+        "primary_key": "meeting_id",
+        "date_column": "meeting_date",
+        "columns": ["meeting_id", "employee_id", "meeting_date", "meeting_time", "MeetingAgenda", "action_items", "notes", "next_meeting_date"],
+        "types": {"meeting_id": "id", "employee_id": "id", "meeting_date": "date", "next_meeting_date": "date"},
+        "search_columns": ["MeetingAgenda", "action_items", "notes"],
+    },
+    "disciplinary": {
+        "primary_key": "disciplinary_id",
+        "date_column": "date",
+        "columns": ["disciplinary_id", "employee_id", "date", "violation", "interview_date", "reason", "comments", "interviewer", "decision"],
+        "types": {"disciplinary_id": "id", "employee_id": "id", "date": "date", "violation": "category", "interview_date": "date"},
+        "search_columns": ["reason", "comments", "decision"],
+    },
+    "performance": {
+        "primary_key": "review_id",
+        "date_column": "review_date",
+        "columns": ["review_id", "employee_id", "review_date", "reviewer", "score", "comments"],
+        "types": {"review_id": "id", "employee_id": "id", "review_date": "date", "reviewer": "category", "score": "int"},
+    },
+    "training": {
+        "primary_key": "training_id",
+        "date_column": "start_date",
+        "columns": ["training_id", "employee_id", "course_name", "start_date", "end_date", "status", "certification"],
+        "types": {
+            "training_id": "id", "employee_id": "id", "course_name": "category",
+            "start_date": "date", "end_date": "date", "status": "category",
+        },
+    },
+}
+TABLES = list(TABLE_SCHEMAS)
+
+# Legacy column names (older forms, uploads and SQLite layouts) -> canonical name
+COLUMN_ALIASES = {
+    "meetings": {"Meeting Agenda": "MeetingAgenda"},
+    "disciplinary": {
+        "Period (Date)": "date",
+        "ID": "employee_id",
+        "Violation": "violation",
+        "type": "violation",
+        "Interview Date": "interview_date",
+        "Reason": "reason",
+        "description": "reason",
+        "Comments": "comments",
+        "Interviewer": "interviewer",
+        "Decision": "decision",
+    },
+}
+
+# Per-row version, bumped by every write and checked against the version a
+# session loaded, so a save never overwrites someone else's newer change
+VERSION_COLUMN = "row_version"
+# Per-table change counter kept in the database and bumped by every committed
+# write, so caches in any process (the apps, the CLI) can tell a table changed
+TABLE_VERSIONS = "table_versions"
+# Temp table of the (key, expected version) pairs a change set is checked against
+EXPECTED_VERSIONS = "temp.expected_versions"
+
+# Secondary indexes created at bootstrap: (name, table, columns)
+INDEXES = [
+    ("ix_employees_department", "employees", ("department",)),
+    ("ix_meetings_employee_id", "meetings", ("employee_id", "meeting_date")),
+    ("ix_meetings_meeting_date", "meetings", ("meeting_date",)),
+    ("ix_disciplinary_employee_id", "disciplinary", ("employee_id", "date")),
+    ("ix_disciplinary_date", "disciplinary", ("date",)),
+    ("ix_performance_employee_id", "performance", ("employee_id", "review_date")),
+    ("ix_performance_review_date", "performance", ("review_date",)),
+    ("ix_training_employee_id", "training", ("employee_id", "start_date")),
+    ("ix_training_start_date", "training", ("start_date",)),
+]
+
+
+def table_columns(table_name):
+    return TABLE_SCHEMAS[table_name]["columns"]
+
+
+def primary_key(table_name):
+    return TABLE_SCHEMAS[table_name]["primary_key"]
+
+
+def search_columns(table_name):
+    return TABLE_SCHEMAS[table_name].get("search_columns", [])
+
+
+def column_types(table_name):
+    return TABLE_SCHEMAS[table_name]["types"]
+
+
+def empty_frame(table_name, columns=None):
+    return type_frame(table_name, pd.DataFrame({col: pd.Series(dtype=object) for col in (columns or table_columns(table_name))}))
+
+
+def type_frame(table_name, df):
+    """Cast a frame's columns to the table's declared in-memory types"""
+    return apply_types(df, column_types(table_name))
+
+
+def normalize_frame(table_name, df):
+    """Map legacy column names to the canonical schema, add missing columns and drop unknown ones"""
+    df = df.copy()
+    for alias, column in COLUMN_ALIASES.get(table_name, {}).items():
+        if alias not in df.columns:
+            continue
+        if column in df.columns:
+            df[column] = df[column].where(df[column].notna(), df[alias])
+        else:
+            df[column] = df[alias]
+    for column in table_columns(table_name):
+        if column not in df.columns:
+            df[column] = None
+    return df[table_columns(table_name)]
+
+
+def read_csv_table(table_name, source):
+    """A CSV file (path or file object) read as text and mapped to a table's canonical columns"""
+    return normalize_frame(table_name, pd.read_csv(source, dtype=str))
+
+
+def key_in(series, keys):
+    """Mask of the values of a key column whose normalized ID is in `keys`"""
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return series.isin([int(key) for key in keys if key.lstrip("-").isdigit() and str(int(key)) == key])
+    if pd.api.types.is_string_dtype(series.dtype) and series.dtype != object:
+        # As objects: isin is then one hash lookup per row, far faster than on Arrow-backed strings
+        return series.str.strip().astype(object).isin(keys)
+    return series.map(normalize_id).astype(object).isin(keys)
+
+
+def conform_rows(rows, frame):
+    """rows (typed) cast to the dtypes of frame's columns, or None if a column was typed differently.
+
+    Text can't join a typed column (e.g. an ID "010" in an Int64 column): the whole
+    table would load as text, so the caller reloads it instead."""
+    casts = {}
+    for col in rows.columns:
+        source, target = rows[col].dtype, frame[col].dtype
+        if source == target or isinstance(target, pd.CategoricalDtype):
+            continue  # concat_typed unions categories
+        if target == object or pd.api.types.is_string_dtype(target):
+            casts[col] = rows[col].astype("string").astype(target)
+        elif pd.api.types.is_datetime64_any_dtype(source) and pd.api.types.is_datetime64_any_dtype(target):
+            casts[col] = rows[col].astype(target)
+        elif pd.api.types.is_numeric_dtype(source) and pd.api.types.is_numeric_dtype(target):
+            try:
+                cast = rows[col].astype(target)
+            except (TypeError, ValueError):
+                return None  # e.g. a fractional value in an integer column
+            casts[col] = cast
+        else:
+            return None
+    return rows.assign(**casts) if casts else rows
+
+
+def patch_frame(table_name, frame, committed):
+    """A cached, typed table frame with committed (ChangeSet, WriteResult) pairs applied; None if it can't be.
+
+    Written rows replace their keys with the new row versions; deleted rows are dropped."""
+    pk = primary_key(table_name)
+    versioned = VERSION_COLUMN in frame.columns
+    for change, result in committed:
+        rows = conform_rows(type_frame(table_name, changed_rows(table_name, change.rows, change.upserts)), frame)
+        if rows is None:
+            return None
+        if versioned:
+            rows = rows.assign(**{VERSION_COLUMN: [result.versions.get(str(key)) for key in rows[pk].astype(object)]})
+            # Deletes are only written for rows the session had seen (see _write_change)
+            deleted = {key for key, version in result.versions.items() if version is None}
+        else:
+            deleted = set(change.deletes)
+        kept = frame[~key_in(frame[pk], set(change.upserts) | deleted)]
+        frame = concat_typed([kept, rows[list(frame.columns)]])
+    return frame
+
+
+def changed_rows(table_name, df, upserts):
+    """The latest version of each upserted row"""
+    pk = primary_key(table_name)
+    return df[key_in(df[pk], upserts)].drop_duplicates(subset=pk, keep="last")
+
+
+# -------------------------------
+# Backends
+# -------------------------------
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def unique_indexes(conn, table_name, column):
+    """Names of the unique indexes of a table on exactly `column` (including a primary key's)"""
+    return [
+        name for _, name, unique, *_ in conn.execute(f"PRAGMA index_list({quote(table_name)})")
+        if unique and [info[2] for info in conn.execute(f"PRAGMA index_info({quote(name)})")] == [column]
+    ]
+
+
+class SQLiteBackend:
+    """Tables in SQLite, written as row-level upserts and deletes"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def init_schema(self):
+        """Create tables, indexes and full-text indexes, and bring legacy tables up to the canonical schema"""
+        with self.db.transaction() as conn:
+            for table_name in TABLES:
+                pk = primary_key(table_name)
+                types = column_types(table_name)
+                column_defs = ", ".join(
+                    f"{quote(col)} TEXT PRIMARY KEY" if col == pk else f"{quote(col)} {sql_type(types.get(col))}"
+                    for col in table_columns(table_name)
+                ) + f", {VERSION_COLUMN} INTEGER NOT NULL DEFAULT 0"
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {quote(table_name)} ({column_defs})")
+                self._migrate_table(conn, table_name)
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {TABLE_VERSIONS} (table_name TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+            create_indexes(conn, INDEXES)
+            for table_name in TABLES:
+                if search_columns(table_name):
+                    create_fts_index(conn, table_name, search_columns(table_name))
+
+    def _migrate_table(self, conn, table_name):
+        pk = primary_key(table_name)
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({quote(table_name)})")}
+        for col in table_columns(table_name):
+            if col not in existing:
+                kind = column_types(table_name).get(col) if col != pk else None
+                conn.execute(f"ALTER TABLE {quote(table_name)} ADD COLUMN {quote(col)} {sql_type(kind)}")
+        if VERSION_COLUMN not in existing:
+            conn.execute(f"ALTER TABLE {quote(table_name)} ADD COLUMN {VERSION_COLUMN} INTEGER NOT NULL DEFAULT 0")
+        for alias, column in COLUMN_ALIASES.get(table_name, {}).items():
+            if alias in existing:
+                conn.execute(
+                    f"UPDATE {quote(table_name)} SET {quote(column)} = {quote(alias)} "
+                    f"WHERE {quote(column)} IS NULL AND {quote(alias)} IS NOT NULL"
+                )
+        # Legacy tables have no key constraint; tables created above already have the
+        # primary key's own unique index, and a second one would only slow every write
+        name = f"ux_{table_name}_{pk}"
+        index = quote(name)
+        if any(other != name for other in unique_indexes(conn, table_name, pk)):
+            conn.execute(f"DROP INDEX IF EXISTS {index}")
+            return
+        try:
+            conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {quote(table_name)} ({quote(pk)})")
+        except sqlite3.IntegrityError:
+            # Tables written by the old full-replace save may hold duplicate keys; keep the latest row
+            conn.execute(
+                f"DELETE FROM {quote(table_name)} WHERE rowid NOT IN "
+                f"(SELECT MAX(rowid) FROM {quote(table_name)} GROUP BY {quote(pk)})"
+            )
+            conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {quote(table_name)} ({quote(pk)})")
+
+    def load(self, table_name, columns=None):
+        """Rows of a table; a full load also reads each row's version"""
+        columns = columns or table_columns(table_name) + [VERSION_COLUMN]
+        query = f"SELECT {', '.join(quote(col) for col in columns)} FROM {quote(table_name)}"
+        with self.db.connection() as conn:
+            return pd.read_sql_query(query, conn)
+
+    def version(self, table_name):
+        """Committed-write counter of a table, shared by every process using the database"""
+        with self.db.connection() as conn:
+            row = conn.execute(f"SELECT version FROM {TABLE_VERSIONS} WHERE table_name = ?", (table_name,)).fetchone()
+        return row[0] if row else 0
+
+    def query(self, sql, params=()):
+        """Run a read-only query (e.g. a pushed-down aggregation) and return its rows as a frame"""
+        with self.db.connection() as conn:
+            return pd.read_sql_query(sql, conn, params=list(params))
+
+    def _write_change(self, conn, change):
+        """Apply one change set, checking each row's version; returns WriteResult.
+
+        The expected versions go into a temp table and are checked with one join,
+        then the rows are written with one executemany per statement."""
+        table_name, pk = change.table_name, primary_key(change.table_name)
+        table = quote(table_name)
+        columns = table_columns(table_name)
+        values = [col for col in columns if col != pk]
+        position = columns.index(pk)
+        dirty = changed_rows(table_name, change.rows, change.upserts)
+        inserts, updates, checks, versions = [], [], [], {}
+        for row in storage_rows(dirty):
+            key = str(row[position])
+            expected = change.expected.get(key)
+            if expected is None:
+                # New row: someone else may have created the same key meanwhile
+                inserts.append(row)
+                checks.append((key, None, "insert"))
+                versions[key] = 1
+            else:
+                updates.append([value for col, value in zip(columns, row) if col != pk] + [key, int(expected)])
+                checks.append((key, int(expected), "update"))
+                versions[key] = int(expected) + 1
+        deletes = []
+        for key in change.deletes:
+            expected = change.expected.get(key)
+            if expected is None:
+                continue  # never saved, or not seen by this session: nothing of ours to delete
+            deletes.append((key, int(expected)))
+            checks.append((key, int(expected), "delete"))
+            versions[key] = None
+        conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {EXPECTED_VERSIONS} (key TEXT PRIMARY KEY, version INTEGER, kind TEXT NOT NULL)")
+        conn.execute(f"DELETE FROM {EXPECTED_VERSIONS}")
+        conn.executemany(f"INSERT OR REPLACE INTO {EXPECTED_VERSIONS} VALUES (?, ?, ?)", checks)
+        # Updated rows must still be at the loaded version, new keys must still be free,
+        # and deleted rows must be gone already or still at the loaded version
+        conflicts = [key for key, in conn.execute(
+            f"SELECT e.key FROM {EXPECTED_VERSIONS} AS e LEFT JOIN {table} AS t ON t.{quote(pk)} = e.key "
+            f"WHERE (e.kind = 'update' AND (t.{quote(pk)} IS NULL OR t.{VERSION_COLUMN} != e.version)) "
+            f"OR (e.kind = 'insert' AND t.{quote(pk)} IS NOT NULL) "
+            f"OR (e.kind = 'delete' AND t.{quote(pk)} IS NOT NULL AND t.{VERSION_COLUMN} != e.version)"
+        )]
+        if conflicts:
+            return WriteResult(len(dirty), 0, conflicts, {})
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(quote(col) for col in columns)}, {VERSION_COLUMN}) "
+            f"VALUES ({', '.join('?' for _ in columns)}, 1)",
+            inserts,
+        )
+        conn.executemany(
+            f"UPDATE {table} SET {', '.join(f'{quote(col)} = ?' for col in values)}, "
+            f"{VERSION_COLUMN} = {VERSION_COLUMN} + 1 WHERE {quote(pk)} = ? AND {VERSION_COLUMN} = ?",
+            updates,
+        )
+        deleted = conn.executemany(f"DELETE FROM {table} WHERE {quote(pk)} = ? AND {VERSION_COLUMN} = ?", deletes).rowcount
+        return WriteResult(len(dirty), max(deleted, 0), [], versions)
+
+    def write_batch(self, changes):
+        """Apply change sets in one transaction, each all-or-nothing in its own savepoint"""
+        results = []
+        with self.db.transaction() as conn:
+            for change in changes:
+                conn.execute("SAVEPOINT change_set")
+                try:
+                    result = self._write_change(conn, change)
+                except Exception:
+                    conn.execute("ROLLBACK TO change_set")
+                    conn.execute("RELEASE change_set")
+                    raise
+                if result.conflicts:
+                    conn.execute("ROLLBACK TO change_set")
+                    result = WriteResult(0, 0, result.conflicts, {})
+                conn.execute("RELEASE change_set")
+                results.append(result)
+            for table_name in dict.fromkeys(change.table_name for change, result in zip(changes, results) if not result.conflicts):
+                (version,) = conn.execute(
+                    f"INSERT INTO {TABLE_VERSIONS} (table_name, version) VALUES (?, 1) "
+                    f"ON CONFLICT (table_name) DO UPDATE SET version = version + 1 RETURNING version",
+                    (table_name,),
+                ).fetchone()
+                # Bumped once per batch, so the table was at version - 1 when this transaction began
+                results = [
+                    result._replace(table_version=(version - 1, version))
+                    if change.table_name == table_name and not result.conflicts else result
+                    for change, result in zip(changes, results)
+                ]
+        return results
+
+
+class SnapshotBackend:
+    """Tables as columnar snapshot files (Parquet/Arrow) under a data directory"""
+
+    def __init__(self, data_dir, fmt="parquet"):
+        self.data_dir = data_dir
+        self.fmt = fmt
+
+    def init_schema(self):
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def version(self, table_name):
+        """Modification time of a table's snapshot file (None if there is none)"""
+        try:
+            return os.stat(snapshot_path(self.data_dir, table_name, resolve_format(self.fmt))).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def load(self, table_name, columns=None):
+        wanted = columns or table_columns(table_name)
+        aliases = [alias for alias, column in COLUMN_ALIASES.get(table_name, {}).items() if column in wanted]
+        df = read_snapshot(self.data_dir, table_name, self.fmt, wanted + aliases, column_types(table_name))
+        if df is None:
+            return empty_frame(table_name, wanted)
+        return normalize_frame(table_name, df)[wanted]
+
+    def write_batch(self, changes):
+        """Merge change sets into their tables' snapshots, rewriting each table once.
+
+        Snapshots keep no row versions, so change sets are applied in order without conflict checks."""
+        results = [None] * len(changes)
+        for table_name in dict.fromkeys(change.table_name for change in changes):
+            pk = primary_key(table_name)
+            before = self.version(table_name)
+            current = self.load(table_name)
+            for position, change in enumerate(changes):
+                if change.table_name != table_name:
+                    continue
+                dirty = changed_rows(table_name, change.rows, change.upserts)
+                kept = current[~key_in(current[pk], set(change.upserts) | set(change.deletes))]
+                current = concat_typed([kept, dirty])
+                results[position] = WriteResult(len(dirty), len(change.deletes), [], {})
+            write_snapshot(self.data_dir, table_name, type_frame(table_name, current), self.fmt, column_types(table_name))
+            table_version = (before, self.version(table_name))
+            results = [
+                result._replace(table_version=table_version) if change.table_name == table_name else result
+                for change, result in zip(changes, results)
+            ]
+        return results
+
+
+# -------------------------------
+# Storage Engine
+# -------------------------------
+# Seconds to wait at exit for queued saves to be written
+SHUTDOWN_TIMEOUT = 30
+
+class StorageEngine:
+    """Single entry point for table storage: schema bootstrap, shared read cache and persistence"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.backend.init_schema()
+        self.cache = TableCache(self._load, self.backend.version)
+        self.writer = WriteQueue(self.backend.write_batch, on_commit=self._committed)
+        atexit.register(self.close)
+
+    def _committed(self, changes, results):
+        # Runs on the writer thread before the saves' futures resolve. The committed
+        # rows are patched into the cached frame, so neither this thread nor the
+        # session settling the save reloads the table. A table nothing was written
+        # to (only conflicts) is invalidated: it changed since it was cached.
+        for table_name in dict.fromkeys(change.table_name for change in changes):
+            committed = [
+                (change, result) for change, result in zip(changes, results)
+                if change.table_name == table_name and not result.conflicts
+            ]
+            table_version = next((result.table_version for _, result in committed if result.table_version), None)
+            if table_version is None:
+                self.cache.invalidate(table_name)
+                continue
+            try:
+                self.cache.patch(table_name, *table_version, lambda df: patch_frame(table_name, df, committed))
+            except Exception as e:
+                # Left invalidated: the next reader reloads it
+                print(f"Updating cached {table_name} failed: {e}", file=sys.stderr)
+
+    def _load(self, table_name, columns=None):
+        df = type_frame(table_name, self.backend.load(table_name, columns))
+        # stderr, so diagnostics never mix into data written to stdout (e.g. CLI CSV output)
+        print(f"Loaded {table_name} data: {len(df)} records, {len(df.columns)} columns", file=sys.stderr)
+        return df
+
+    def load(self, table_name, columns=None):
+        """Shared, read-only frame of a table (read from the backend once per version).
+
+        With `columns`, the frame holds at least those columns."""
+        return self.cache.get(table_name, columns)
+
+    def version(self, table_name):
+        return self.cache.version(table_name)
+
+    @property
+    def supports_sql(self):
+        """True if queries can be pushed down to the backend"""
+        return hasattr(self.backend, "query")
+
+    def query(self, sql, params=()):
+        """Run a read-only SQL query against the backend (SQLite backend only)"""
+        return self.backend.query(sql, params)
+
+    def submit(self, table_name, df, upserts, deletes, expected=None, key=None):
+        """Hand the upserted/deleted keys of `df` to the single writer without waiting (write-behind).
+
+        `expected` maps each key to the row version the caller loaded (None for new rows).
+        Returns a Future of a WriteResult; if any row has changed since, nothing is written
+        and the result lists the conflicting keys. A still-queued save with the same `key`
+        (e.g. session + table) is replaced by this one."""
+        if not upserts and not deletes:
+            future = Future()
+            future.set_result(WriteResult(0, 0, [], {}))
+            return future
+        change = ChangeSet(table_name, normalize_frame(table_name, df), set(upserts), set(deletes), dict(expected or {}))
+        return self.writer.submit(change, key)
+
+    def forget(self, key):
+        """Release the row versions the writer tracks for `key` once its saves have been reloaded"""
+        self.writer.forget(key)
+
+    def save(self, table_name, df, upserts, deletes, expected=None, timeout=None):
+        """submit() and wait for the commit"""
+        return self.submit(table_name, df, upserts, deletes, expected).result(timeout)
+
+    def status(self):
+        """Writer status (see WriteQueue.status)"""
+        return self.writer.status()
+
+    def close(self, timeout=SHUTDOWN_TIMEOUT):
+        """Flush queued saves to storage and stop the writer (registered to run at exit)"""
+        self.writer.close(timeout)
+
+
+# -------------------------------
+# Headless Access
+# -------------------------------
+def open_storage(backend, location):
+    """StorageEngine over a SQLite database file ('sqlite') or a snapshot directory ('parquet'/'arrow')"""
+    if backend == "sqlite":
+        return StorageEngine(SQLiteBackend(ConnectionManager(location)))
+    return StorageEngine(SnapshotBackend(location, backend))
+
+
+def import_table(storage, table_name, df, replace=False):
+    """Upsert the rows of a frame into a table by primary key; with `replace`, also delete
+    every row the frame doesn't have. Returns the WriteResult."""
+    pk = primary_key(table_name)
+    table = KeyedTable(storage.load(table_name), pk)
+    if replace:
+        table.replace(df)
+    else:
+        for row in KeyedTable.from_frame(df, pk).base.to_dict("records"):
+            table.upsert(row)
+    keys = table.upserted_keys | table.deleted_keys
+    return storage.save(
+        table_name, table.changed_frame(), table.upserted_keys, table.deleted_keys, table.base_values(VERSION_COLUMN, keys)
+    )
@@ -0,0 +1,78 @@
+import threading
+
+# -------------------------------
+# Shared Read Cache
+# -------------------------------
+# Whole tables are loaded once per process and shared by every session.
+# Each table has a change counter; a save bumps it and either patches the
+# saved rows into the cached frame or leaves the next reader to reload it.
+# The counter is paired with the storage's own version of the table, so
+# writes from another process (e.g. the CLI) are picked up too. Cached
+# frames are shared and must be treated as read-only: edits build a new
+# frame (copy-on-write) instead of mutating in place.
+
+
+class TableCache:
+    """Process-wide read-only cache of whole tables, keyed by a per-table change counter"""
+
+    def __init__(self, loader, source_version=None):
+        self._loader = loader
+        self._source_version = source_version
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._frames = {}
+
+    def version(self, table_name):
+        """Current change counter of a table (with the storage's version of it, if known)"""
+        if self._source_version is None:
+            return self._versions.get(table_name, 0)
+        return self._versions.get(table_name, 0), self._source_version(table_name)
+
+    def get(self, table_name, columns=None):
+        """Return the shared frame for the current version, loading it on first use.
+
+        With `columns`, a cached full frame is returned if there is one; otherwise
+        only those columns are loaded and cached separately."""
+        with self._lock:
+            version = self.version(table_name)
+            full = self._frames.get((table_name, None))
+            if full is not None and full[0] == version:
+                return full[1]
+            key = (table_name, tuple(columns) if columns else None)
+            cached = self._frames.get(key)
+            if cached is None or cached[0] != version:
+                cached = self._frames[key] = (version, self._loader(table_name, columns))
+                if columns is None:
+                    self._drop(table_name, keep_full=True)
+            return cached[1]
+
+    def _drop(self, table_name, keep_full=False):
+        for key in [key for key in self._frames if key[0] == table_name]:
+            if not (keep_full and key[1] is None):
+                del self._frames[key]
+
+    def patch(self, table_name, before, after, update):
+        """Apply a committed write to a table's cached frame instead of reloading it.
+
+        `update(frame)` returns the new frame (or None if it can't). It is only applied
+        to a frame loaded at storage version `before`, i.e. with no other write since;
+        the patched frame is then current as of `after`. Otherwise the table is invalidated."""
+        with self._lock:
+            counter = self._versions.get(table_name, 0)
+            full = self._frames.get((table_name, None))
+            self._versions[table_name] = counter + 1
+            self._drop(table_name)
+            if self._source_version is None:
+                loaded, patched = counter, counter + 1
+            else:
+                loaded, patched = (counter, before), (counter + 1, after)
+            if full is not None and full[0] == loaded:
+                frame = update(full[1])
+                if frame is not None:
+                    self._frames[(table_name, None)] = (patched, frame)
+
+    def invalidate(self, table_name):
+        """Bump a table's change counter after a write so readers reload it"""
+        with self._lock:
+            self._versions[table_name] = self._versions.get(table_name, 0) + 1
+            self._drop(table_name)
@@ -0,0 +1,188 @@
+import pandas as pd
+
+from column_types import concat_typed
+
+# -------------------------------
+# Keyed In-Memory Tables
+# -------------------------------
+# A session's view of a table is the shared, read-only base frame plus its
+# own upserts and deletes, keyed by primary key. Upsert, delete and get are
+# O(1); the edits are folded into one contiguous frame lazily, only when
+# something needs it (reports, uploads, exports), and saving writes just the
+# edited rows. Keys are normalized to strings, matching the TEXT key columns.
+# An optional `coerce` function casts edited rows to the base frame's types.
+# Every edit bumps a revision number, so a save in the background can later
+# settle exactly the edits it wrote and leave newer ones pending.
+
+
+def normalize_id(value):
+    """Normalize an ID (str, int or float from CSV) to its canonical string form"""
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+class KeyedTable:
+    """Base frame plus this session's upserts and deletes, indexed by primary key"""
+
+    def __init__(self, base, key, coerce=None):
+        self.key = key
+        self._base = base
+        self._coerce = coerce
+        self._base_index = None  # key -> row position in base, built on first use
+        self._upserts = {}  # key -> row dict, in insertion order
+        self._deleted = set()
+        self._frame = None
+        self._revision = 0
+        self._touched = {}  # key -> revision of its last edit
+
+    @classmethod
+    def from_frame(cls, df, key, coerce=None):
+        """Table from an arbitrary frame (e.g. an upload): keys normalized, last duplicate wins"""
+        df = df.assign(**{key: df[key].map(normalize_id)})
+        df = df[df[key].notna()].drop_duplicates(subset=key, keep="last").reset_index(drop=True)
+        return cls(coerce(df) if coerce else df, key, coerce)
+
+    @property
+    def base(self):
+        return self._base
+
+    @property
+    def columns(self):
+        return self._base.columns
+
+    @property
+    def dirty(self):
+        return bool(self._upserts or self._deleted)
+
+    @property
+    def upserted_keys(self):
+        return set(self._upserts)
+
+    @property
+    def deleted_keys(self):
+        return set(self._deleted)
+
+    @property
+    def revision(self):
+        """Number of edits made so far"""
+        return self._revision
+
+    def _touch(self, keys):
+        self._revision += 1
+        for key in keys:
+            self._touched[key] = self._revision
+        self._frame = None
+
+    def _index(self):
+        if self._base_index is None:
+            self._base_index = {normalize_id(value): pos for pos, value in enumerate(self._base[self.key])}
+        return self._base_index
+
+    def __len__(self):
+        if not self.dirty:
+            return len(self._base)
+        index = self._index()
+        replaced = sum(1 for key in self._upserts if key in index)
+        removed = sum(1 for key in self._deleted if key in index)
+        return len(self._base) - replaced - removed + len(self._upserts)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    def get(self, key):
+        """Row for a key as a dict, or None"""
+        key = normalize_id(key)
+        if key in self._upserts:
+            return self._upserts[key]
+        if key in self._deleted:
+            return None
+        pos = self._index().get(key)
+        return None if pos is None else self._base.iloc[pos].to_dict()
+
+    def upsert(self, row):
+        """Insert or replace the row with this row's key, in O(1)"""
+        key = normalize_id(row[self.key])
+        if key is None:
+            raise ValueError(f"Row has no {self.key}")
+        self._upserts.pop(key, None)  # re-inserting moves the row to the end
+        self._upserts[key] = {**row, self.key: key}
+        self._deleted.discard(key)
+        self._touch([key])
+
+    def delete(self, key):
+        """Remove the row with this key, in O(1)"""
+        key = normalize_id(key)
+        self._upserts.pop(key, None)
+        self._deleted.add(key)
+        self._touch([key])
+
+    def replace(self, df):
+        """Replace every row with those of `df`, recorded as upserts and deletes"""
+        new = KeyedTable.from_frame(df, self.key, self._coerce).base
+        keys = [normalize_id(key) for key in new[self.key]]
+        new_keys = set(keys)
+        self._deleted = {key for key in self._index() if key not in new_keys}
+        self._upserts = dict(zip(keys, new.to_dict("records")))
+        self._touched = {}
+        self._touch(set(self._upserts) | self._deleted)
+
+    def _rows_frame(self, rows):
+        df = pd.DataFrame(rows, columns=self._base.columns)
+        return self._coerce(df) if self._coerce else df
+
+    def changed_frame(self):
+        """Only the upserted rows"""
+        return self._rows_frame(list(self._upserts.values()))
+
+    def tail(self, n):
+        """Last n rows without compacting the edits"""
+        rows = list(self._upserts.values())[-n:]
+        if len(rows) >= n:
+            return self._rows_frame(rows)
+        touched = set(self._upserts) | self._deleted
+        base_tail = self._base.tail(n - len(rows) + len(touched))
+        if touched:
+            base_tail = base_tail[~base_tail[self.key].map(normalize_id).isin(touched)]
+        return concat_typed([base_tail.tail(n - len(rows)), self._rows_frame(rows)])
+
+    def frame(self):
+        """The whole table as one frame, folding in the edits if needed"""
+        if not self.dirty:
+            return self._base
+        if self._frame is None:
+            index = self._index()
+            positions = [index[key] for key in set(self._upserts) | self._deleted if key in index]
+            kept = self._base.drop(self._base.index[positions])
+            self._frame = concat_typed([kept, self.changed_frame()])
+        return self._frame
+
+    def base_values(self, column, keys):
+        """Base-frame value of `column` for each key (None for keys not in the base)"""
+        index = self._index()
+        values = self._base[column] if column in self._base.columns else None
+        result = {}
+        for key in keys:
+            value = values.iloc[index[key]] if values is not None and key in index else None
+            result[key] = None if value is None or pd.isna(value) else value
+        return result
+
+    def rebase(self, base, drop=()):
+        """Put this session's edits on top of a newer base frame, discarding the edits to `drop` keys"""
+        self._base = base
+        self._base_index = None
+        for key in drop:
+            self._upserts.pop(key, None)
+            self._deleted.discard(key)
+            self._touched.pop(key, None)
+        self._frame = None
+
+    def settle(self, base, revision):
+        """Rebase onto a base that now holds the edits saved at `revision`; later edits stay pending"""
+        self.rebase(base, drop=[key for key, touched in self._touched.items() if touched <= revision])
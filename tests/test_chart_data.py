@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from chart_data import downsample_series, lttb_indices, top_n
+
+
+def test_top_n_keeps_the_largest_and_sums_the_rest():
+    df = pd.DataFrame({"department": [f"D{i}" for i in range(30)], "team": "x", "count": range(30)})
+    result = top_n(df, ["department", "team"], "count", n=5)
+    assert list(result["department"]) == ["D29", "D28", "D27", "D26", "Other (26)"]
+    assert list(result["team"]) == ["x", "x", "x", "x", ""]
+    assert result["count"].iloc[-1] == sum(range(26))
+    assert result["count"].sum() == df["count"].sum()
+
+
+def test_top_n_other_uses_the_given_aggregation():
+    df = pd.DataFrame({"reviewer": list("abcdef"), "score": [5, 9, 1, 7, 3, 2]})
+    result = top_n(df, ["reviewer"], "score", n=3, other_agg="mean")
+    assert list(result["reviewer"]) == ["b", "d", "Other (4)"]
+    assert result["score"].iloc[-1] == np.mean([5, 1, 3, 2])
+
+
+def test_top_n_leaves_small_frames_alone():
+    df = pd.DataFrame({"department": ["Ops", "OCC"], "count": [1, 2]})
+    assert top_n(df, ["department"], "count", n=2) is df
+
+
+def test_lttb_keeps_ends_and_peaks():
+    n = 1000
+    x = np.arange(n, dtype=float)
+    y = np.zeros(n)
+    y[[137, 512]] = [50.0, -40.0]
+    kept = lttb_indices(x, y, 50)
+    assert len(kept) == 50
+    assert kept[0] == 0 and kept[-1] == n - 1
+    assert (np.diff(kept) > 0).all()
+    assert {137, 512} <= set(kept)
+
+
+def test_lttb_returns_everything_when_nothing_to_drop():
+    x = y = np.arange(10, dtype=float)
+    assert list(lttb_indices(x, y, 10)) == list(range(10))
+    assert list(lttb_indices(x, y, 2)) == list(range(10))
+
+
+def test_downsample_series_with_a_date_index():
+    index = pd.date_range("2024-01-01", periods=2000, freq="h")
+    series = pd.Series(np.sin(np.arange(2000) / 50.0), index=index)
+    result = downsample_series(series, points=100)
+    assert len(result) == 100
+    assert result.index[0] == index[0] and result.index[-1] == index[-1]
+    short = series.head(50)
+    assert downsample_series(short, points=100) is short
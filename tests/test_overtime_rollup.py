@@ -0,0 +1,87 @@
+import io
+
+import pytest
+
+import overtime
+from sqlite_pool import ConnectionManager
+
+
+def entry(date, department, hours, audit_status="Pending", overtime_type="Planned", depot="North"):
+    return {
+        "date": date, "week_start": date, "week_end": date, "employee_id": "E1", "name": "Ann",
+        "department": department, "roster_group": "A", "overtime_type": overtime_type, "hours": hours,
+        "depot": depot, "notes": "", "reviewed_by": "", "audit_status": audit_status, "discrepancy_comments": "",
+    }
+
+
+def rollup(db):
+    with db.connection() as conn:
+        return conn.execute(
+            f"SELECT day, department, audit_status, overtime_type, depot, hours, entries "
+            f"FROM {overtime.ROLLUP_TABLE} ORDER BY 1, 2, 3, 4, 5"
+        ).fetchall()
+
+
+def grouped_entries(db):
+    """What the rollup must hold: the same groups computed from overtime_entries"""
+    with db.connection() as conn:
+        return conn.execute(
+            f"SELECT COALESCE(date, ''), COALESCE(department, ''), COALESCE(audit_status, ''), "
+            f"COALESCE(overtime_type, ''), COALESCE(depot, ''), COALESCE(SUM(hours), 0), COUNT(*) "
+            f"FROM {overtime.TABLE_NAME} GROUP BY 1, 2, 3, 4, 5 ORDER BY 1, 2, 3, 4, 5"
+        ).fetchall()
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = ConnectionManager(str(tmp_path / "overtime.db"))
+    overtime.init_db(db)
+    return db
+
+
+def test_insert_adds_to_the_rollup(db):
+    overtime.insert_entry(db, entry("2024-03-01", "Ops", 2.5))
+    overtime.insert_entry(db, entry("2024-03-01", "Ops", 1.0))
+    overtime.insert_entry(db, entry("2024-03-02", "OCC", 4.0, depot=None))
+    assert rollup(db) == grouped_entries(db) == [
+        ("2024-03-01", "Ops", "Pending", "Planned", "North", 3.5, 2),
+        ("2024-03-02", "OCC", "Pending", "Planned", "", 4.0, 1),
+    ]
+
+
+def test_delete_subtracts_and_drops_empty_groups(db):
+    overtime.insert_entry(db, entry("2024-03-01", "Ops", 2.5))
+    overtime.insert_entry(db, entry("2024-03-01", "Ops", 1.0))
+    overtime.insert_entry(db, entry("2024-03-02", "OCC", 4.0))
+    first, _, last = [row[0] for row in overtime.fetch_page(db).itertuples(index=False)][::-1]
+    overtime.delete_entry(db, int(first))
+    overtime.delete_entry(db, int(last))
+    assert rollup(db) == grouped_entries(db) == [("2024-03-01", "Ops", "Pending", "Planned", "North", 1.0, 1)]
+    overtime.delete_entry(db, 12345)  # no such entry
+    assert rollup(db) == grouped_entries(db)
+
+
+def test_import_adds_valid_rows_only(db):
+    overtime.insert_entry(db, entry("2024-03-01", "Ops", 1.0))
+    csv = (
+        ",".join(overtime.ENTRY_COLUMNS) + "\n"
+        "2024-03-01,2024-02-26,2024-03-03,E2,Bo,Ops,A,Planned,2,North,,,Pending,\n"
+        "03/02/2024,,,E3,Cy,OCC,B,Unplanned,1.5,,,,Approved,\n"
+        "2024-03-02,,,E4,Di,OCC,B,Unplanned,lots,,,,Approved,\n"
+        "not a date,,,E5,Ed,OCC,B,Unplanned,1,,,,Approved,\n"
+    )
+    inserted, rejected_count, rejected = overtime.import_data(db, io.BytesIO(csv.encode()))
+    assert (inserted, rejected_count) == (2, 2)
+    assert list(rejected["hours"]) == ["lots", "1"]
+    assert rollup(db) == grouped_entries(db) == [
+        ("2024-03-01", "Ops", "Pending", "Planned", "North", 3.0, 2),
+        ("2024-03-02", "OCC", "Approved", "Unplanned", "", 1.5, 1),
+    ]
+
+
+def test_rollup_is_built_from_existing_entries(db):
+    overtime.insert_entry(db, entry("2024-03-01", "Ops", 2.0))
+    with db.transaction() as conn:
+        conn.execute(f"DROP TABLE {overtime.ROLLUP_TABLE}")
+    overtime.init_db(db)
+    assert rollup(db) == grouped_entries(db) == [("2024-03-01", "Ops", "Pending", "Planned", "North", 2.0, 1)]
@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+from storage import open_storage
+
+COLUMNS = ["employee_id", "first_name", "last_name", "department", "job_title", "email", "phone", "employment_status"]
+
+
+def employees(*rows):
+    return pd.DataFrame([[employee_id, first_name, "Smith", "Ops", "Driver", "", "", "Active"] for employee_id, first_name in rows], columns=COLUMNS)
+
+
+def stored(storage):
+    df = storage.backend.load("employees")
+    return dict(zip(df["employee_id"], zip(df["first_name"], df["row_version"])))
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = open_storage("sqlite", str(tmp_path / "employees.db"))
+    yield storage
+    storage.close()
+
+
+def test_insert_then_update_moves_row_and_table_versions(storage):
+    result = storage.save("employees", employees(("1", "Ann")), ["1"], [])
+    assert (result.conflicts, result.versions, result.table_version) == ([], {"1": 1}, (0, 1))
+    result = storage.save("employees", employees(("1", "Anne")), ["1"], [], expected={"1": 1})
+    assert (result.conflicts, result.versions, result.table_version) == ([], {"1": 2}, (1, 2))
+    assert stored(storage) == {"1": ("Anne", 2)}
+    assert storage.backend.version("employees") == 2
+
+
+def test_update_against_a_newer_update_conflicts(storage):
+    storage.save("employees", employees(("1", "Ann")), ["1"], [])
+    assert storage.save("employees", employees(("1", "Anne")), ["1"], [], expected={"1": 1}).conflicts == []
+    result = storage.save("employees", employees(("1", "Annie")), ["1"], [], expected={"1": 1})
+    assert (result.conflicts, result.upserted, result.table_version) == (["1"], 0, None)
+    assert stored(storage) == {"1": ("Anne", 2)}
+
+
+def test_insert_of_a_key_someone_else_inserted_conflicts(storage):
+    assert storage.save("employees", employees(("2", "Bob")), ["2"], []).conflicts == []
+    result = storage.save("employees", employees(("2", "Rob")), ["2"], [])
+    assert result.conflicts == ["2"]
+    assert stored(storage) == {"2": ("Bob", 1)}
+
+
+def test_delete_of_a_row_updated_since_conflicts(storage):
+    storage.save("employees", employees(("3", "Cy")), ["3"], [])
+    storage.save("employees", employees(("3", "Cyrus")), ["3"], [], expected={"3": 1})
+    result = storage.save("employees", employees(), [], ["3"], expected={"3": 1})
+    assert (result.conflicts, result.deleted) == (["3"], 0)
+    assert stored(storage) == {"3": ("Cyrus", 2)}
+    result = storage.save("employees", employees(), [], ["3"], expected={"3": 2})
+    assert (result.conflicts, result.deleted) == ([], 1)
+    # Deleting a row that is already gone is not a conflict
+    assert storage.save("employees", employees(), [], ["3"], expected={"3": 2}).conflicts == []
+    assert stored(storage) == {}
+
+
+def test_conflicting_change_set_writes_none_of_its_rows(storage):
+    storage.save("employees", employees(("1", "Ann")), ["1"], [])
+    result = storage.save("employees", employees(("1", "Ann"), ("4", "Dee")), ["1", "4"], [])
+    assert result.conflicts == ["1"]
+    assert stored(storage) == {"1": ("Ann", 1)}
+    assert storage.backend.version("employees") == 1
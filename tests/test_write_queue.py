@@ -0,0 +1,100 @@
+import threading
+
+from write_queue import ChangeSet, WriteQueue, WriteResult
+
+
+def change(upserts=(), deletes=(), expected=None, name="t"):
+    return ChangeSet(name, None, set(upserts), set(deletes), dict(expected or {}))
+
+
+class RecordingWriter:
+    """write_batch stub: records each batch, holds the first one until released, commits every row at `versions`"""
+
+    def __init__(self, versions=None):
+        self.batches = []
+        self.versions = versions or {}
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, changes):
+        self.batches.append(changes)
+        self.started.set()
+        assert self.release.wait(5)
+        return [
+            WriteResult(len(c.upserts), len(c.deletes), [], {key: self.versions.get(key) for key in c.upserts | c.deletes})
+            for c in changes
+        ]
+
+
+def test_waiting_change_set_is_replaced_by_one_with_the_same_key():
+    writer = RecordingWriter()
+    queue = WriteQueue(writer)
+    try:
+        first = queue.submit(change(["a"]), key="other")
+        assert writer.started.wait(5)  # the writer is now busy with `first`
+        stale = queue.submit(change(["1"], name="stale"), key="session")
+        latest = queue.submit(change(["1", "2"], name="latest"), key="session")
+        unrelated = queue.submit(change(["3"], name="unrelated"))
+        assert queue.status()["queued"] == 2
+        writer.release.set()
+        assert stale.result(5) is latest.result(5)
+        assert first.result(5).upserted == 1 and unrelated.result(5).upserted == 1
+    finally:
+        queue.close(5)
+    assert [[c.table_name for c in batch] for batch in writer.batches[1:]] == [["latest", "unrelated"]]
+
+
+def test_expected_versions_move_past_earlier_commits_with_the_same_key():
+    writer = RecordingWriter(versions={"1": 3, "2": None})
+    writer.release.set()
+    queue = WriteQueue(writer)
+    try:
+        queue.submit(change(["1"], ["2"]), key="session").result(5)
+        queue.submit(change(["1", "2", "4"], expected={"1": 1, "2": 5, "4": 7}), key="session").result(5)
+        queue.submit(change(["1"], expected={"1": 9}), key="session").result(5)
+        queue.submit(change(["1"], expected={"1": 1}), key="someone else").result(5)
+        queue.forget("session")
+        queue.submit(change(["1"], expected={"1": 1}), key="session").result(5)
+    finally:
+        queue.close(5)
+    advanced = [batch[0].expected for batch in writer.batches[1:]]
+    assert advanced == [
+        # Committed version wins over an older one; a committed delete clears it; untouched keys keep theirs
+        {"1": 3, "2": None, "4": 7},
+        # A version newer than the committed one is kept
+        {"1": 9},
+        # Only the same key is advanced, and nothing is after forget()
+        {"1": 1},
+        {"1": 1},
+    ]
+
+
+def test_change_sets_without_a_key_are_never_advanced():
+    writer = RecordingWriter(versions={"1": 3})
+    writer.release.set()
+    queue = WriteQueue(writer)
+    try:
+        queue.submit(change(["1"])).result(5)
+        queue.submit(change(["1"], expected={"1": 1})).result(5)
+    finally:
+        queue.close(5)
+    assert writer.batches[1][0].expected == {"1": 1}
+    assert queue._versions == {}
+
+
+def test_failed_batch_fails_every_future_and_is_reported():
+    def write_batch(changes):
+        raise RuntimeError("disk full")
+
+    queue = WriteQueue(write_batch)
+    try:
+        future = queue.submit(change(["1"]), key="session")
+        try:
+            future.result(5)
+        except RuntimeError as e:
+            assert str(e) == "disk full"
+        else:
+            raise AssertionError("the write error was not raised")
+        assert str(queue.status()["last_error"]) == "disk full"
+    finally:
+        queue.close(5)
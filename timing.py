@@ -0,0 +1,16 @@
+import time
+
+# -------------------------------
+# Rerun Timing
+# -------------------------------
+# Streamlit re-executes the whole app script on every interaction, so each
+# app times its runs and logs the slow ones to the console.
+SLOW_RERUN_SECONDS = 0.25
+
+
+def log_rerun_time(started, label, threshold=SLOW_RERUN_SECONDS):
+    """Print how long a script run took (since `started`, a perf_counter value) if over `threshold` seconds"""
+    elapsed = time.perf_counter() - started
+    if elapsed > threshold:
+        print(f"Slow rerun ({label}): {elapsed * 1000:.0f} ms")
+    return elapsed
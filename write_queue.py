@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+
+# -------------------------------
+# Single-Writer Queue
+# -------------------------------
+# Every session hands its row-level change sets to one background writer
+# thread instead of writing itself, and carries on without waiting (write-
+# behind). The writer drains whatever is queued, applies it as one batch (one
+# transaction in SQLite, each change set in its own savepoint) and resolves
+# each submitter's future with that change set's result. Sessions never
+# contend for the write lock, and concurrent saves share a commit.
+#
+# A change set submitted under a key (e.g. session + table) replaces one with
+# the same key that is still waiting, so rapid repeated saves of a growing
+# set of edits are written once. Row versions of a change set are moved
+# forward past whatever earlier change sets with its key committed, so a
+# session can save again before it has seen its previous save land; once
+# the session has reloaded those rows it calls forget(key) to drop them.
+ChangeSet = namedtuple("ChangeSet", ["table_name", "rows", "upserts", "deletes", "expected"])
+# table_version: (before, after) storage version of the table around the commit, if the backend reports it
+WriteResult = namedtuple("WriteResult", ["upserted", "deleted", "conflicts", "versions", "table_version"], defaults=[None])
+MAX_BATCH = 64
+# First element of the keys given to change sets submitted without one
+_ANONYMOUS = object()
+
+
+class WriteQueue:
+    """Background single writer: submit() change sets, get futures of WriteResult"""
+
+    def __init__(self, write_batch, on_commit=None, max_batch=MAX_BATCH):
+        self._write_batch = write_batch
+        self._on_commit = on_commit
+        self.max_batch = max_batch
+        self._cond = threading.Condition()
+        self._pending = OrderedDict()  # key -> (change, [futures]), oldest first
+        self._in_flight = []  # keys of the change sets being written
+        self._closed = False
+        self._sequence = 0
+        self._versions = {}  # key -> {row key: version committed (None once deleted)}
+        self.commits = 0
+        self.last_commit = None
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+        self._thread.start()
+
+    def submit(self, change, key=None):
+        """Queue a ChangeSet; returns a Future resolved once it is committed (or rejected).
+
+        A waiting change set with the same `key` is replaced by this one."""
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("write queue is closed")
+            if key is None:
+                self._sequence += 1
+                key = (_ANONYMOUS, self._sequence)
+            _, futures = self._pending.pop(key, (None, []))
+            self._pending[key] = (change, futures + [future])
+            self._cond.notify_all()
+        return future
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            batch = []
+            while self._pending and len(batch) < self.max_batch:
+                key, (change, futures) = self._pending.popitem(last=False)
+                batch.append((key, self._advance(key, change), futures))
+            self._in_flight = [key for key, _, _ in batch]
+            return batch
+
+    def _advance(self, key, change):
+        """Move a change set's expected row versions past what earlier change sets with its key committed.
+
+        Versions only grow, so the newer of the submitted and committed version is the current one."""
+        committed = self._versions.get(key)
+        if not committed:
+            return change
+        expected = dict(change.expected)
+        for row_key in set(change.upserts) | set(change.deletes):
+            if row_key in committed:
+                version, known = committed[row_key], expected.get(row_key)
+                expected[row_key] = version if known is None or version is None else max(known, version)
+        return change._replace(expected=expected)
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return  # closed and drained
+            try:
+                self._apply(batch)
+            finally:
+                with self._cond:
+                    self._in_flight = []
+                    self._cond.notify_all()
+
+    def _apply(self, batch):
+        changes = [change for _, change, _ in batch]
+        try:
+            results = self._write_batch(changes)
+        except Exception as e:
+            self.last_error = e
+            for _, _, futures in batch:
+                for future in futures:
+                    future.set_exception(e)
+            return
+        self.commits += 1
+        self.last_commit = time.time()
+        self.last_error = None
+        with self._cond:
+            for (key, _, _), result in zip(batch, results):
+                # Nobody saves again under a generated key, so its versions are never needed
+                if result.versions and key[0] is not _ANONYMOUS:
+                    self._versions.setdefault(key, {}).update(result.versions)
+        try:
+            if self._on_commit is not None:
+                self._on_commit(changes, results)
+        finally:
+            for (_, _, futures), result in zip(batch, results):
+                for future in futures:
+                    future.set_result(result)
+
+    def status(self):
+        """Snapshot of the queue: change sets waiting/being written, commits, last commit time and error"""
+        with self._cond:
+            return {
+                "queued": len(self._pending),
+                "writing": len(self._in_flight),
+                "commits": self.commits,
+                "last_commit": self.last_commit,
+                "last_error": self.last_error,
+            }
+
+    def forget(self, key):
+        """Drop the row versions committed under a key once its submitter has reloaded them.
+
+        Kept while a change set with that key is still waiting or being written."""
+        with self._cond:
+            if key not in self._pending and key not in self._in_flight:
+                self._versions.pop(key, None)
+
+    def close(self, timeout=None):
+        """Write everything already queued, then stop the writer thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)